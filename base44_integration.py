@@ -2,17 +2,30 @@
 Base44 Integration Module.
 Fetches player list from Base44, scrapes stats, and pushes results back to Base44.
 """
-import json
 import logging
 import os
 import asyncio
-from datetime import datetime
+import contextlib
+import functools
+import gzip
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 import requests
 import aiohttp
+import diskcache
+import ijson
+from aiolimiter import AsyncLimiter
+import orjson
+import xxhash
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from scraper.scraper_api import get_player_stats
-from scraper.error_handler import log_error
+from scraper.error_handler import log_error, retry_after_seconds, RETRY_STATUSES
 from scraper.schedule_scraper import scrape_team_schedule
-from scraper.config import get_schedule_url
+from scraper.config import get_schedule_url, CACHE_DIR, SCRAPE_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
@@ -29,127 +42,469 @@ BASE44_API_URL = BASE44_API_URL.rstrip("/")
 # API Endpoints
 PLAYERS_ENDPOINT = f"{BASE44_API_URL}/api/getPlayersToScrape"
 STATS_WEBHOOK = f"{BASE44_API_URL}/api/receivePlayerStats"
+STATS_BATCH_WEBHOOK = f"{STATS_WEBHOOK}/batch"
 UPCOMING_GAMES_WEBHOOK = f"{BASE44_API_URL}/api/receiveUpcomingGames"
 
+# Max players from the same school scraped at once (they all hit one host)
+SCHOOL_CONCURRENCY = int(os.getenv("SCHOOL_CONCURRENCY", "4"))
+# Number of school schedules fetched in parallel
+SCHEDULE_CONCURRENCY = int(os.getenv("SCHEDULE_CONCURRENCY", "10"))
+# Number of players sent per batch stats upload
+STATS_BATCH_SIZE = int(os.getenv("STATS_BATCH_SIZE", "50"))
+# Max seconds a partial batch waits before it is pushed
+STATS_FLUSH_INTERVAL = 5
+# Scraped results waiting to be pushed; scrapers block when the queue is full
+PUSH_QUEUE_SIZE = 32
+# Max webhook requests per second, and max open connections to any single host
+BASE44_RATE_LIMIT = float(os.getenv("BASE44_RATE_LIMIT", "10"))
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("MAX_CONNECTIONS_PER_HOST", "16"))
+
+# Pooled HTTP session shared by every Base44 call so TCP/TLS connections are reused
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=RETRY_STATUSES),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update({"x-api-key": BASE44_API_KEY})
+
+# The player-list request never changes, so build (URL, headers, auth) once
+PLAYERS_REQUEST = SESSION.prepare_request(requests.Request("GET", PLAYERS_ENDPOINT))
+
+# On-disk cache of the player list; the TTL forces a full refresh even if the
+# server never sends validators
+PLAYERS_CACHE = diskcache.Cache(os.path.join(CACHE_DIR, "players"))
+PLAYERS_CACHE_TTL = 6 * 60 * 60
+# In-process copy of the cached entry and its expiry (epoch seconds), so a 304
+# on a later scheduler tick doesn't re-read and unpickle the list from disk
+_players_memo = {"entry": None, "expires": 0.0}
+
+# Hash of the games last pushed for each player, used to skip unchanged pushes
+PUSHED_CACHE = diskcache.Cache(os.path.join(CACHE_DIR, "pushed"))
+
+# Headers for aiohttp webhook requests; sent per request because the async session
+# is also used to scrape school websites
+BASE44_HEADERS = {"x-api-key": BASE44_API_KEY, "Content-Type": "application/json"}
+
+# Client-side throttle for webhook pushes, plus retry policy for throttled responses
+BASE44_LIMITER = AsyncLimiter(BASE44_RATE_LIMIT, 1)
+BASE44_MAX_RETRIES = 5
+
+# Only this much of an error response body is read for logging
+ERROR_BODY_LIMIT = 1024
+
+# Webhook bodies larger than this are sent gzip-compressed
+GZIP_MIN_BYTES = 1024
+BASE44_GZIP_HEADERS = {**BASE44_HEADERS, "Content-Encoding": "gzip"}
+_gzip_bodies = True
+
+# Webhook bodies are encoded with orjson; OPT_UTC_Z renders UTC datetimes with a "Z" suffix
+JSON_OPTIONS = orjson.OPT_UTC_Z
+
+def _log_error_body(status, content_type, snippet):
+    """Log the start of an HTTP error body; non-text bodies are not worth decoding."""
+    if content_type.startswith(("text/", "application/json")):
+        logger.error("Base44 returned %s: %s", status, snippet.decode("utf-8", "replace"))
+
+async def _check_response(response):
+    """Raise for an HTTP error status, logging at most ERROR_BODY_LIMIT bytes of the body."""
+    if response.status >= 400:
+        _log_error_body(
+            response.status,
+            response.headers.get("Content-Type", ""),
+            await response.content.read(ERROR_BODY_LIMIT),
+        )
+    response.raise_for_status()
+
+def _normalize_player(raw):
+    """
+    Coerce a Base44 player record to the string fields the scraper and webhooks use.
+
+    Done once per fetch so downstream code never re-converts. Returns None for
+    records without a jersey number.
+    """
+    try:
+        return {
+            **raw,
+            "number": str(raw["number"]),
+            "season": str(raw.get("season", "2026")),
+            "sport": str(raw.get("sport", "baseball")),
+        }
+    except (KeyError, TypeError):
+        logger.warning("Skipping malformed player record: %r", raw)
+        return None
+
+def _cached_players_entry():
+    """Return the cached (etag, last_modified, players) entry, or None."""
+    if _players_memo["entry"] and time.time() < _players_memo["expires"]:
+        return _players_memo["entry"]
+    entry, expires = PLAYERS_CACHE.get(PLAYERS_ENDPOINT, expire_time=True)
+    _players_memo["entry"] = entry
+    _players_memo["expires"] = expires or 0.0
+    return entry
+
+def _store_players_entry(entry):
+    """Save a freshly fetched player list to disk and to the in-process memo."""
+    PLAYERS_CACHE.set(PLAYERS_ENDPOINT, entry, expire=PLAYERS_CACHE_TTL)
+    _players_memo["entry"] = entry
+    _players_memo["expires"] = time.time() + PLAYERS_CACHE_TTL
+
 def fetch_players_from_base44():
-    """Fetch the list of players to scrape from Base44."""
+    """
+    Fetch the list of players to scrape from Base44.
+
+    The last response is kept on disk with its ETag/Last-Modified validators, so
+    an unchanged list comes back as a body-less 304 and is served from cache.
+    """
     try:
-        headers = {"x-api-key": BASE44_API_KEY}
-        response = requests.get(PLAYERS_ENDPOINT, headers=headers, timeout=30)
-        response.raise_for_status()
-        players = response.json()
-        if not isinstance(players, list):
-            logger.error(f"Expected list of players, got: {type(players).__name__}")
+        cached = _cached_players_entry()
+        request = PLAYERS_REQUEST
+        if cached:
+            etag, last_modified, _ = cached
+            request = PLAYERS_REQUEST.copy()
+            if etag:
+                request.headers["If-None-Match"] = etag
+            if last_modified:
+                request.headers["If-Modified-Since"] = last_modified
+        
+        with SESSION.send(request, timeout=30, stream=True) as response:
+            if response.status_code == 304 and cached:
+                players = cached[2]
+                logger.info("Player list unchanged, using %d cached players", len(players))
+                return players
+            
+            if response.status_code >= 400:
+                _log_error_body(
+                    response.status_code,
+                    response.headers.get("Content-Type", ""),
+                    response.raw.read(ERROR_BODY_LIMIT, decode_content=True),
+                )
+            response.raise_for_status()
+            # Decode the top-level array incrementally from the socket rather than
+            # buffering the whole body first; a non-array response yields no items
+            response.raw.decode_content = True
+            players = [
+                player for player in map(_normalize_player, ijson.items(response.raw, "item", use_float=True))
+                if player
+            ]
+        
+        if not players:
+            logger.error("Base44 returned no players")
             return []
-        logger.info(f"Fetched {len(players)} players from Base44")
+        
+        _store_players_entry((response.headers.get("ETag"), response.headers.get("Last-Modified"), players))
+        logger.info("Fetched %d players from Base44", len(players))
         return players
     except Exception as e:
-        logger.error(f"Error fetching players: {e}")
+        logger.error("Error fetching players: %s", e)
         return []
 
-def push_stats_to_base44(player, stats_result):
+def _build_stats_payload(player, stats_result, ts=None):
+    """Build the webhook payload for a single player's scraped stats."""
+    return {
+        "playerId": player["id"],
+        "name": player["name"],
+        "number": player["number"],
+        "school": stats_result.get("school", player["school"]),
+        "season": player["season"],
+        "sport": player["sport"],
+        "games": stats_result.get("games", []),
+        "success": stats_result.get("success", True),
+        "last_updated": ts or datetime.now(timezone.utc),
+    }
+
+def with_backoff(func):
+    """
+    Rate-limit a Base44 request coroutine and retry it when the server throttles.
+
+    RETRY_STATUSES responses (shared with the scrapers' async_retry) are retried
+    up to BASE44_MAX_RETRIES times, sleeping for the server's Retry-After when
+    given, otherwise exponential backoff with jitter.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        for attempt in range(BASE44_MAX_RETRIES + 1):
+            try:
+                async with BASE44_LIMITER:
+                    return await func(*args, **kwargs)
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUSES or attempt == BASE44_MAX_RETRIES:
+                    raise
+                delay = retry_after_seconds(e.headers)
+                if delay is None:
+                    delay = 0.5 * 2 ** attempt + random.uniform(0, 0.5)
+                logger.warning("Base44 returned %s, retrying in %.1fs (%d/%d)", e.status, delay, attempt + 1, BASE44_MAX_RETRIES)
+                await asyncio.sleep(delay)
+    return wrapper
+
+@with_backoff
+async def _post_to_base44(session, url, payload, timeout=30):
+    """
+    POST a JSON payload to a Base44 webhook, raising on HTTP errors.
+
+    Bodies over GZIP_MIN_BYTES are gzip-compressed. If the server answers 415,
+    compression is switched off for the rest of the process and the request is
+    resent uncompressed.
+    """
+    global _gzip_bodies
+    body = orjson.dumps(payload, option=JSON_OPTIONS)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    
+    if _gzip_bodies and len(body) > GZIP_MIN_BYTES:
+        async with session.post(
+            url,
+            data=gzip.compress(body, compresslevel=4),
+            headers=BASE44_GZIP_HEADERS,
+            timeout=client_timeout,
+        ) as response:
+            if response.status != 415:
+                await _check_response(response)
+                return
+        logger.warning("Base44 does not accept gzip request bodies, sending uncompressed")
+        _gzip_bodies = False
+    
+    async with session.post(
+        url,
+        data=body,
+        headers=BASE44_HEADERS,
+        timeout=client_timeout,
+    ) as response:
+        await _check_response(response)
+
+def _games_digest(player, stats_result):
+    """
+    Return the hash of a player's games if they need pushing, or None to skip.
+
+    Players with no games, or whose games hash matches the last successful push,
+    are skipped.
+    """
+    games = stats_result.get("games")
+    if not games:
+        return None
+    digest = xxhash.xxh64(orjson.dumps(games)).hexdigest()
+    if PUSHED_CACHE.get(f"p:{player['id']}") == digest:
+        return None
+    return digest
+
+def _mark_pushed(player, digest):
+    """Remember the games hash that was last pushed for a player."""
+    PUSHED_CACHE.set(f"p:{player['id']}", digest)
+
+async def push_stats_to_base44(session, player, stats_result, ts=None):
     """Push scraped stats back to Base44 webhook."""
     try:
-        payload = {
-            "playerId": player["id"],
-            "name": player["name"],
-            "number": str(player["number"]),
-            "school": stats_result.get("school", player["school"]),
-            "season": str(player.get("season", "2026")),
-            "sport": str(player.get("sport", "baseball")),
-            "games": stats_result.get("games", []),
-            "success": stats_result.get("success", True),
-            "last_updated": datetime.utcnow().isoformat() + "Z",
-        }
-        headers = {
-            "Content-Type": "application/json",
-            "x-api-key": BASE44_API_KEY,
-        }
-        response = requests.post(STATS_WEBHOOK, json=payload, headers=headers, timeout=30)
-        response.raise_for_status()
-        logger.info(f"Successfully pushed stats for {player['name']} (ID: {player['id']})")
+        digest = _games_digest(player, stats_result)
+        if digest is None:
+            logger.info("No new games for %s (ID: %s), skipping push", player['name'], player['id'])
+            return True
+        payload = _build_stats_payload(player, stats_result, ts)
+        await _post_to_base44(session, STATS_WEBHOOK, payload)
+        _mark_pushed(player, digest)
+        logger.info("Successfully pushed stats for %s (ID: %s)", player['name'], player['id'])
         return True
     except Exception as e:
-        logger.error(f"Failed to push stats for {player.get('name', 'unknown')}: {e}")
+        logger.error("Failed to push stats for %s: %s", player.get('name', 'unknown'), e)
         return False
 
-def push_upcoming_games_to_base44(school_name, games):
+async def push_stats_batch_to_base44(session, items, ts=None):
+    """
+    Push stats for several players in a single request.
+
+    Players with no games or unchanged games since the last push are skipped
+    and count as pushed.
+
+    Args:
+        session: Shared aiohttp.ClientSession
+        items: List of (player, stats_result) tuples
+        ts: Run timestamp used as last_updated (defaults to now)
+
+    Returns:
+        int: Number of players successfully pushed
+    """
+    if not items:
+        return 0
+    try:
+        changed = []
+        for player, stats_result in items:
+            digest = _games_digest(player, stats_result)
+            if digest is not None:
+                changed.append((player, stats_result, digest))
+        skipped = len(items) - len(changed)
+        if not changed:
+            logger.info("No new games for %d players, skipping batch push", skipped)
+            return skipped
+        
+        ts = ts or datetime.now(timezone.utc)
+        payload = {"players": [_build_stats_payload(p, r, ts) for p, r, _ in changed]}
+        await _post_to_base44(session, STATS_BATCH_WEBHOOK, payload, timeout=60)
+        # Inside the try: a failed cache write must not take the pusher task down
+        for player, _, digest in changed:
+            _mark_pushed(player, digest)
+    except aiohttp.ClientResponseError as e:
+        if e.status not in (400, 413):
+            logger.error("Failed to push stats batch of %d players: %s", len(changed), e)
+            return skipped
+        # A bad record or an oversized body - push one by one to isolate it
+        logger.warning("Batch push rejected (%s), retrying %d players individually", e.status, len(changed))
+        results = await asyncio.gather(*[push_stats_to_base44(session, p, r, ts) for p, r, _ in changed])
+        return skipped + sum(results)
+    except Exception as e:
+        logger.error("Failed to push stats batch of %d players: %s", len(items), e)
+        return 0
+    logger.info("Successfully pushed stats batch of %d players (%d unchanged)", len(changed), skipped)
+    return len(items)
+
+async def push_upcoming_games_to_base44(session, school_name, games, ts=None):
     """Push upcoming games for a team to Base44."""
     try:
         payload = {
             "school": school_name,
             "upcomingGames": games,
-            "last_updated": datetime.utcnow().isoformat() + "Z",
-        }
-        headers = {
-            "Content-Type": "application/json",
-            "x-api-key": BASE44_API_KEY,
+            "last_updated": ts or datetime.now(timezone.utc),
         }
-        response = requests.post(UPCOMING_GAMES_WEBHOOK, json=payload, headers=headers, timeout=30)
-        response.raise_for_status()
-        logger.info(f"Successfully pushed {len(games)} upcoming games for {school_name}")
+        await _post_to_base44(session, UPCOMING_GAMES_WEBHOOK, payload)
+        logger.info("Successfully pushed %d upcoming games for %s", len(games), school_name)
         return True
     except Exception as e:
-        logger.error(f"Failed to push upcoming games for {school_name}: {e}")
+        logger.error("Failed to push upcoming games for %s: %s", school_name, e)
         return False
 
-async def process_player(player):
-    """Async wrapper for get_player_stats and push."""
+def _scrape_player(player):
+    """Scrape one player. Runs in a worker thread; returns the result or None."""
     try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, 
-            lambda: get_player_stats(
-                player_name=player["name"],
-                jersey_number=str(player["number"]),
-                school=player["school"],
-                season=str(player.get("season", "2026")),
-                sport=str(player.get("sport", "baseball"))
-            )
+        result = get_player_stats(
+            player_name=player["name"],
+            jersey_number=player["number"],
+            school=player["school"],
+            season=player["season"],
+            sport=player["sport"]
         )
-        
         if result and (result.get("success") or result.get("games")):
-            push_stats_to_base44(player, result)
-            return True
-        return False
+            return result
+        return None
     except Exception as e:
-        logger.error(f"Error in process_player for {player.get('name')}: {e}")
-        return False
+        logger.error("Error in process_player for %s: %s", player.get('name'), e)
+        return None
+
+async def process_player(player, executor=None):
+    """Async wrapper that runs the blocking scrape on the given executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, _scrape_player, player)
+
+async def _push_worker(session, queue, ts):
+    """
+    Drain scraped (player, result) pairs from the queue and push them in batches.
 
-async def sync_schedules(players):
+    A batch is flushed once STATS_BATCH_SIZE players have accumulated or
+    STATS_FLUSH_INTERVAL seconds have passed since the last flush. A None item
+    ends the stream. Returns the number of players pushed.
+    """
+    loop = asyncio.get_running_loop()
+    batch = []
+    pushed = 0
+    deadline = loop.time() + STATS_FLUSH_INTERVAL
+    while True:
+        try:
+            item = await asyncio.wait_for(queue.get(), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            item = ()  # timed out: flush whatever is buffered
+        if item:
+            batch.append(item)
+            if len(batch) < STATS_BATCH_SIZE:
+                continue
+        if batch:
+            pushed += await push_stats_batch_to_base44(session, batch, ts)
+            batch = []
+        deadline = loop.time() + STATS_FLUSH_INTERVAL
+        if item is None:
+            return pushed
+
+async def sync_schedules(session, players, ts=None):
     """Sync schedules for all unique schools in the player list."""
-    schools = list(set(p["school"] for p in players))
-    logger.info(f"Syncing schedules for {len(schools)} schools...")
+    schools = list(dict.fromkeys(p["school"] for p in players))
+    logger.info("Syncing schedules for %d schools...", len(schools))
+    
+    semaphore = asyncio.Semaphore(SCHEDULE_CONCURRENCY)
     
-    async with aiohttp.ClientSession() as session:
-        for school in schools:
+    async def sync_school(school):
+        async with semaphore:
             schedule_url = get_schedule_url(school)
-            if schedule_url:
-                upcoming_games = await scrape_team_schedule(session, schedule_url)
-                if upcoming_games:
-                    push_upcoming_games_to_base44(school, upcoming_games)
+            if not schedule_url:
+                return
+            upcoming_games = await scrape_team_schedule(session, schedule_url)
+        if upcoming_games:
+            await push_upcoming_games_to_base44(session, school, upcoming_games, ts)
+    
+    await asyncio.gather(*[sync_school(s) for s in schools])
 
-async def run_sync_async(concurrency=5):
-    """Main sync function with concurrency control."""
+async def run_sync_async(concurrency=SCRAPE_CONCURRENCY, per_host=MAX_CONNECTIONS_PER_HOST, session=None):
+    """
+    Main sync function with concurrency control.
+
+    Pass a long-lived `session` to reuse its DNS cache and pooled connections
+    across runs; otherwise one is opened (with `per_host` as its per-host cap)
+    and closed for this run.
+    """
     logger.info("Starting Base44 sync...")
     players = fetch_players_from_base44()
     if not players:
         return
     
-    # Sync upcoming games
-    await sync_schedules(players)
-    
-    semaphore = asyncio.Semaphore(concurrency)
-    
-    async def sem_process(player):
-        async with semaphore:
-            return await process_player(player)
+    # Every record pushed in this run shares one last_updated timestamp
+    run_ts = datetime.now(timezone.utc)
     
-    tasks = [sem_process(p) for p in players]
-    results = await asyncio.gather(*tasks)
+    # One aiohttp session for the whole run: schedule scraping and stats pushes
+    # share its connection pool instead of blocking the loop on requests
+    if session is None:
+        connector = aiohttp.TCPConnector(limit_per_host=per_host, ttl_dns_cache=300, keepalive_timeout=30)
+        session_ctx = aiohttp.ClientSession(connector=connector)
+    else:
+        session_ctx = contextlib.nullcontext(session)
+    async with session_ctx as session:
+        # Sync upcoming games
+        await sync_schedules(session, players, run_ts)
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        # Per-school cap so one large roster can't monopolize the workers or
+        # hammer a single athletics site, without slowing other schools down
+        school_limits = defaultdict(lambda: asyncio.Semaphore(SCHOOL_CONCURRENCY))
+        # Scrapers feed a bounded queue drained by a single pusher, so pushes
+        # overlap with scraping and at most one batch is held in memory
+        queue = asyncio.Queue(maxsize=PUSH_QUEUE_SIZE)
+        pusher = asyncio.create_task(_push_worker(session, queue, run_ts))
+        
+        # Scrapes are blocking (requests + Selenium), so give them a pool sized to
+        # the concurrency limit rather than competing for the loop's default executor
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            async def sem_process(player):
+                async with school_limits[player["school"]], semaphore:
+                    result = await process_player(player, executor)
+                if result:
+                    await queue.put((player, result))
+            
+            # One failed player must not cancel the rest of the run
+            scrapes = asyncio.gather(*[sem_process(p) for p in players], return_exceptions=True)
+            # The pusher only returns after the final None, so finishing first means
+            # it died; with no one draining the queue every scraper would block on put
+            await asyncio.wait({scrapes, pusher}, return_when=asyncio.FIRST_COMPLETED)
+            if pusher.done():
+                scrapes.cancel()
+                # gather() collects the cancellation instead of raising it here
+                await asyncio.gather(scrapes, return_exceptions=True)
+                pusher.result()  # re-raises the pusher's error
+            for player, outcome in zip(players, scrapes.result()):
+                if isinstance(outcome, Exception):
+                    logger.error("Unhandled error processing %s: %s", player.get("name"), outcome)
+        
+        # Same race for the end-of-stream marker, which can also wait on a full queue
+        end = asyncio.ensure_future(queue.put(None))
+        await asyncio.wait({end, pusher}, return_when=asyncio.FIRST_COMPLETED)
+        end.cancel()
+        success_count = await pusher
     
-    success_count = sum(1 for r in results if r)
-    logger.info(f"Sync complete. Success: {success_count}/{len(players)}")
+    logger.info("Sync complete. Success: %d/%d", success_count, len(players))
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -2,13 +2,17 @@
 Scheduled scraper for Base44 integration.
 Runs at: 9 AM, then every hour from 12 PM to 12 AM (14 times daily).
 """
-import schedule
-import time
+import signal
 import logging
 import asyncio
-from datetime import datetime
+import contextlib
+from datetime import datetime, time, timedelta
+import aiohttp
 import pytz
 from base44_integration import run_sync_async
+from scraper.config import SCHOOLS, SCRAPE_CONCURRENCY
+
+__all__ = ['run_scraper_job', 'run_forever', 'next_run_time']
 
 # Configure logging
 logging.basicConfig(
@@ -24,60 +28,89 @@ logger = logging.getLogger(__name__)
 # Central Time Zone
 CENTRAL_TZ = pytz.timezone('America/Chicago')
 
-def run_scraper_job():
+# Hours (24h clock) at which the scraper runs: 9 AM, then hourly from noon through midnight
+RUN_HOURS = (9, *range(12, 24), 0)
+
+
+async def run_scraper_job(session=None):
     """
     Main scraper job that runs on schedule.
     Uses async sync function for high performance.
     """
     current_time = datetime.now(CENTRAL_TZ).strftime('%Y-%m-%d %H:%M:%S %Z')
-    logger.info(f"Starting scheduled scraper run at {current_time}")
+    logger.info("Starting scheduled scraper run at %s", current_time)
     
     try:
-        # Run the async sync
-        asyncio.run(run_sync_async(concurrency=10))
+        # Run the async sync; SCRAPE_CONCURRENCY doubles as the per-host cap so
+        # the pool never holds more sockets than there are workers to use them
+        await run_sync_async(concurrency=SCRAPE_CONCURRENCY, per_host=SCRAPE_CONCURRENCY, session=session)
         logger.info("Scraper run complete.")
     except Exception as e:
-        logger.error(f"Fatal error in scraper job: {str(e)}")
+        logger.error("Fatal error in scraper job: %s", e)
 
-def schedule_jobs():
+def next_run_time(now):
     """
-    Set up the schedule:
+    Return the next scheduled run strictly after `now` (Central time):
     - 9:00 AM
     - Every hour from 12:00 PM to 12:00 AM (midnight)
     """
-    # Morning update
-    schedule.every().day.at("09:00").do(run_scraper_job)
+    for days_ahead in (0, 1):
+        day = now.date() + timedelta(days=days_ahead)
+        for hour in sorted(RUN_HOURS):
+            candidate = CENTRAL_TZ.localize(datetime.combine(day, time(hour)))
+            if candidate > now:
+                return candidate
+
+async def warm_connections(session):
+    """HEAD every known school site once so DNS is cached before the first wave."""
+    domains = {school["domain"] for school in SCHOOLS.values()}
+    timeout = aiohttp.ClientTimeout(total=10)
     
-    # Hourly updates from noon to midnight
-    for hour in range(12, 24):
-        time_str = f"{hour:02d}:00"
-        schedule.every().day.at(time_str).do(run_scraper_job)
-    schedule.every().day.at("00:00").do(run_scraper_job)
+    async def head(domain):
+        try:
+            async with session.head(f"https://{domain}/", allow_redirects=False, timeout=timeout):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("Warm-up request to %s failed: %s", domain, e)
     
-    logger.info("Scheduler configured for 14 daily runs.")
+    await asyncio.gather(*(head(d) for d in domains))
+    logger.info("Warmed connections to %d school sites.", len(domains))
+
+async def run_forever():
+    """Run once now, then sleep straight through to each scheduled slot."""
+    # SIGTERM cancels the loop so the shared session below is closed cleanly
+    with contextlib.suppress(NotImplementedError):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    
+    logger.info("Scheduler configured for %d daily runs.", len(RUN_HOURS))
+    
+    # One session for the life of the process: the DNS cache outlives each wave
+    # instead of every run re-resolving every school host
+    connector = aiohttp.TCPConnector(limit_per_host=SCRAPE_CONCURRENCY, ttl_dns_cache=3600, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await warm_connections(session)
+        
+        # Run immediately on start
+        logger.info("Running initial scrape...")
+        await run_scraper_job(session)
+        
+        logger.info("Scheduler is now running. Press Ctrl+C to stop.")
+        
+        while True:
+            now = datetime.now(CENTRAL_TZ)
+            next_run = next_run_time(now)
+            logger.info("Next run at %s", next_run.strftime('%Y-%m-%d %H:%M %Z'))
+            await asyncio.sleep(max(0.0, (next_run - now).total_seconds()))
+            await run_scraper_job(session)
 
 if __name__ == "__main__":
     logger.info("=" * 50)
     logger.info("Base44 College Baseball/Softball Scraper Scheduler")
     logger.info("=" * 50)
     
-    # Set up schedule
-    schedule_jobs()
-    
-    # Run immediately on start
-    logger.info("Running initial scrape...")
-    run_scraper_job()
-    
-    # Keep running
-    logger.info("Scheduler is now running. Press Ctrl+C to stop.")
-    
-    while True:
-        try:
-            schedule.run_pending()
-            time.sleep(60) 
-        except KeyboardInterrupt:
-            logger.info("Scheduler stopped by user.")
-            break
-        except Exception as e:
-            logger.error(f"Scheduler error: {str(e)}")
-            time.sleep(60)
+    try:
+        asyncio.run(run_forever())
+    except KeyboardInterrupt:
+        logger.info("Scheduler stopped by user.")
+    except asyncio.CancelledError:
+        logger.info("Scheduler stopped by SIGTERM.")
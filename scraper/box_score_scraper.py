@@ -1,57 +1,163 @@
 import asyncio
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
 import aiohttp
-from bs4 import BeautifulSoup
+import pandas as pd
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
 import logging
 from .platform_detector import detect_platform
 from .data_cleaner import clean_stat_value
+from .error_handler import async_retry, RETRY_STATUSES
 
 logger = logging.getLogger(__name__)
 
+# Only table subtrees are materialized; nav/layout markup is skipped by the parser
+_TABLES_ONLY = SoupStrainer('table')
+# Headers that mark a table as a player stat table
+_STAT_HEADERS = frozenset({'player', 'name', 'ab', 'r', 'h', 'rbi'})
+# Columns kept as text; every other column is a stat, cleaned cell by cell
+_TEXT_COLUMNS = frozenset({'player', 'name', 'pos', 'position'})
+# Stat table selectors per platform; other platforms scan every table
+_PLATFORM_TABLE_CSS = {
+    # Sidearm box scores typically use specific classes
+    'sidearm': 'table.sidearm-table, table.box-score-table',
+    # Presto uses standard table structures
+    'presto': 'table.stats-table, table.linescore',
+}
+# Same selectors compiled once for the BeautifulSoup fallback
+_PLATFORM_TABLES = {platform: sv.compile(css) for platform, css in _PLATFORM_TABLE_CSS.items()}
+_ALL_TABLES = sv.compile('table')
+# Box score parsing runs here so one page's parse overlaps the next page's
+# download; lxml/pandas release the GIL for most of the work
+_PARSE_EXECUTOR = ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 1),
+                                     thread_name_prefix="box-parse")
+
+@async_retry(default=b"")
 async def fetch_box_score(session, box_url):
-    """Fetch box score HTML from a URL."""
-    try:
-        async with session.get(box_url, timeout=15) as response:
-            if response.status == 200:
-                return await response.text()
-    except Exception as e:
-        logger.error(f"Error fetching box score from {box_url}: {e}")
-    return ""
+    """
+    Fetch box score HTML from a URL.
+
+    Returns the raw body bytes; lxml sniffs the charset itself, so there is no
+    need to decode the page into a str first.
+    """
+    async with session.get(box_url, timeout=15) as response:
+        if response.status in RETRY_STATUSES:
+            response.raise_for_status()
+        if response.status != 200:
+            return b""
+        return await response.read()
 
 def parse_box_score(html, platform):
     """Universal box score parser - extracts player stats tables."""
-    soup = BeautifulSoup(html, 'html.parser')
+    teams_data = _parse_box_score_frames(html, platform)
+    if teams_data:
+        return teams_data
+    # BeautifulSoup only covers for lexbor failing on the markup, not for a
+    # page that simply has no stat tables (e.g. box score not posted yet)
+    try:
+        tables = _table_rows_lexbor(html, platform)
+    except Exception as e:
+        logger.debug("lexbor failed on box score, using BeautifulSoup: %s", e)
+        tables = None
+    if tables is None:
+        tables = _table_rows_soup(html, platform)
+    return _stat_records(tables)
+
+def _parse_box_score_frames(html, platform):
+    """
+    Read every stat table in one pass with pandas (lxml's C table reader).
+
+    Only the platform's stat tables are handed to pandas, as in the row-by-row
+    parsers. Returns an empty list when nothing usable is found so the caller
+    can fall back to walking the tables row by row.
+    """
+    css = _PLATFORM_TABLE_CSS.get(platform)
+    if css:
+        # read_html's attrs= matches the class attribute exactly, which misses
+        # multi-class tables, so select the tables up front instead
+        html = ''.join(table.html for table in LexborHTMLParser(html).css(css))
+        if not html:
+            return []
+    source = io.BytesIO(html) if isinstance(html, bytes) else io.StringIO(html)
+    try:
+        # Empty cells stay '' rather than NaN, as in the row-by-row parsers
+        frames = pd.read_html(source, flavor='lxml', keep_default_na=False)
+    except (ValueError, ImportError):
+        # read_html raises ValueError when the page has no <table>
+        return []
+
+    teams_data = []
+    for df in frames:
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(-1)
+        df.columns = [str(c).strip().lower() for c in df.columns]
+        if _STAT_HEADERS.isdisjoint(df.columns):
+            continue
+        teams_data.extend(_clean_records(df.to_dict(orient='records')))
+    return teams_data
+
+def _clean_records(records):
+    """
+    Run every stat cell through clean_stat_value; text columns (names,
+    positions) are left as they are. Every parser path goes through here so
+    records have the same shape whichever one succeeded.
+    """
+    for record in records:
+        for column, value in record.items():
+            if column not in _TEXT_COLUMNS:
+                record[column] = clean_stat_value(value)
+    return records
+
+def _table_rows_lexbor(html, platform):
+    """
+    Tables as lists of rows of (tag, text) cells, via selectolax's lexbor engine.
+
+    Returns None when lexbor finds no <table> anywhere in the page.
+    """
+    tree = LexborHTMLParser(html)
+    if tree.css_first('table') is None:
+        return None
+    tables = []
+    for table in tree.css(_PLATFORM_TABLE_CSS.get(platform, 'table')):
+        tables.append([
+            [(cell.tag, cell.text().strip()) for cell in row.iter() if cell.tag in ('td', 'th')]
+            for row in table.css('tr')
+        ])
+    return tables
+
+def _table_rows_soup(html, platform):
+    """BeautifulSoup equivalent of _table_rows_lexbor, for pages lexbor can't make sense of."""
+    soup = BeautifulSoup(html, 'lxml', parse_only=_TABLES_ONLY)
+    tables = []
+    for table in _PLATFORM_TABLES.get(platform, _ALL_TABLES).select(soup):
+        tables.append([
+            [(cell.name, cell.get_text().strip()) for cell in row.find_all(['td', 'th'], recursive=False)]
+            for row in table.find_all('tr')
+        ])
+    return tables
+
+def _stat_records(tables):
+    """Turn parsed tables into one dict per player row, keyed by the header row."""
     teams_data = []
 
-    if platform == 'sidearm':
-        # Sidearm box scores typically use specific classes
-        tables = soup.select('table.sidearm-table, table.box-score-table')
-    elif platform == 'presto':
-        # Presto uses standard table structures
-        tables = soup.select('table.stats-table, table.linescore')
-    else:
-        # Universal fallback: find all tables
-        tables = soup.find_all('table')
-
-    for table in tables:
-        # Check if this table contains player stats
-        headers = [th.text.strip().lower() for th in table.find_all('th')]
+    for rows in tables:
+        if not rows:
+            continue
+        # Check if this table contains player stats; headers come from the
+        # first row only rather than every <th> in the body
+        headers = [text.lower() for tag, text in rows[0] if tag == 'th']
         
         # Look for common stat headers
-        if any(header in headers for header in ['player', 'name', 'ab', 'r', 'h', 'rbi']):
-            rows = table.find_all('tr')[1:]  # Skip header row
-            
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    player_data = {}
-                    for i, cell in enumerate(cells):
-                        if i < len(headers):
-                            key = headers[i]
-                            value = clean_stat_value(cell.text.strip())
-                            player_data[key] = value
-                    
-                    if player_data:
-                        teams_data.append(player_data)
+        if _STAT_HEADERS.isdisjoint(headers):
+            continue
+        records = []
+        for cells in rows[1:]:  # Skip header row
+            if len(cells) >= 2:
+                records.append({headers[i]: text for i, (_, text) in enumerate(cells[:len(headers)])})
+        teams_data.extend(_clean_records(records))
 
     return teams_data
 
@@ -61,5 +167,6 @@ async def scrape_box_score(session, box_url):
     if not html:
         return []
 
+    loop = asyncio.get_running_loop()
     platform = detect_platform(box_url, html)
-    return parse_box_score(html, platform)
+    return await loop.run_in_executor(_PARSE_EXECUTOR, parse_box_score, html, platform)
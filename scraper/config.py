@@ -2,6 +2,36 @@
 Configuration for college baseball/softball scraper.Maps school names to their website domains and roster URLs.
 Supports multiple platforms: SIDEARM, PrestoSports, NCAA.com, and more.
 """
+import os
+import re
+from functools import lru_cache
+
+# HTTP settings shared by the page fetchers
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+REQUEST_TIMEOUT = 15  # seconds
+
+# Directory for on-disk caches (HTTP responses, browser profiles)
+CACHE_DIR = os.getenv("BASE44_CACHE_DIR", "cache")
+
+# Players scraped at once, by both the scheduler and base44_integration
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "10"))
+
+# Season scraped when the caller doesn't pass one
+DEFAULT_SEASON = "2026"
+
+# Selenium settings for the game-log scrapers
+SELENIUM_HEADLESS = True
+SELENIUM_TIMEOUT = 10  # seconds to wait for an element before giving up
+# Selenium Grid hub (e.g. http://grid:4444/wd/hub); local Chrome when unset
+SELENIUM_GRID_URL = os.getenv("SELENIUM_GRID_URL")
+# Preinstalled chromedriver; skips webdriver-manager's version check entirely
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+# Scrape SIDEARM game logs with Playwright instead of Selenium
+USE_PLAYWRIGHT = os.getenv("USE_PLAYWRIGHT", "").lower() in ("1", "true", "yes")
+PLAYWRIGHT_WORKERS = int(os.getenv("PLAYWRIGHT_WORKERS", "4"))
 
 SCHOOLS = {
     "Belmont": {
@@ -74,11 +104,25 @@ PLATFORM_SELECTORS = {
 
 # Auto-detect platform based on domain patterns
 PLATFORM_DOMAINS = {
-    "sidearm": ["sidearmdev", "sidearmsports", ".com"],  # Most college sites use SIDEARM
+    "sidearm": ["sidearmdev", "sidearmsports"],
     "prestosports": ["prestosports.com", "prestosports"],
     "ncaa": ["ncaa.com"],
 }
 
+# All domain patterns folded into one regex; the named group that matched is the platform
+_PLATFORM_RE = re.compile('|'.join(
+    f'(?P<{platform}{i}>{re.escape(pattern)})'
+    for platform, patterns in PLATFORM_DOMAINS.items()
+    for i, pattern in enumerate(patterns)
+))
+
+# Most college sites run SIDEARM on their own .com, which no pattern can tell
+# apart from any other .com - so fall back to the schools we know use it
+_KNOWN_SIDEARM_DOMAINS = frozenset(
+    school["domain"] for school in SCHOOLS.values() if school.get("type") == "sidearm"
+)
+
+@lru_cache(maxsize=256)
 def detect_platform(domain):
     """
     Auto-detect which platform a website uses based on domain.
@@ -86,10 +130,11 @@ def detect_platform(domain):
     """
     domain_lower = domain.lower()
     
-    for platform, patterns in PLATFORM_DOMAINS.items():
-        for pattern in patterns:
-            if pattern in domain_lower:
-                return platform
+    match = _PLATFORM_RE.search(domain_lower)
+    if match:
+        return match.lastgroup.rstrip('0123456789')
+    if domain_lower in _KNOWN_SIDEARM_DOMAINS:
+        return "sidearm"
     
     return "generic"
 
@@ -156,7 +201,7 @@ def get_schedule_url(school_name, sport="baseball"):
             query = f"{school_name} {sport} schedule"
             search_url = f"https://www.google.com/search?q={requests.utils.quote(query)}"
             response = requests.get(search_url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, 'lxml')
             
             # Look for athletic website links
             for link in soup.find_all('a', href=True):
@@ -1,16 +1,35 @@
 import re
-from datetime import datetime
+from datetime import date, datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+_NUM_RE = re.compile(r'[^\d\.-]')
+# Already-clean numbers ('0', '12', '.333', '-1.5') skip the substitution entirely
+_FAST_NUM = re.compile(r'-?(?:\d+(?:\.\d*)?|\.\d+)')
+_WS_RE = re.compile(r'\s+')
+_ALPHA_RE = re.compile(r'[^a-z\s-]')
+
+# normalize_date's formats as regexes (strptime probes each format in turn, raising on every miss):
+# "Feb 15" / "Feb 15, 2026" and "2/15/26" / "02/15/2026"
+_MONTHS = {m: i for i, m in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+_MONTH_DAY_RE = re.compile(r'([A-Za-z]{3})\s+(\d{1,2})(?:,\s+(\d{4}))?')
+_NUMERIC_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})')
+
 def clean_stat_value(value):
     """Converts string stat values to floats or ints, handling '-' and empty strings."""
     if value is None or value == "" or value == "-":
         return 0.0
+    if isinstance(value, (int, float)):
+        return value
+    
+    value = str(value)
+    if _FAST_NUM.fullmatch(value):
+        return float(value) if '.' in value else int(value)
     
     # Remove any non-numeric characters except decimal and negative sign
-    clean_val = re.sub(r'[^\d\.-]', '', str(value))
+    clean_val = _NUM_RE.sub('', value)
     
     try:
         if '.' in clean_val:
@@ -24,23 +43,22 @@ def normalize_date(date_str):
     if not date_str:
         return None
         
-    current_year = datetime.now().year
-    
-    formats = [
-        "%b %d, %Y", # Feb 15, 2026
-        "%b %d",     # Feb 15 (assume current year)
-        "%m/%d/%y",  # 2/15/26
-        "%m/%d/%Y",  # 02/15/2026
-    ]
-    
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            if fmt == "%b %d":
-                dt = dt.replace(year=current_year)
-            return dt.date().isoformat()
-        except ValueError:
-            continue
+    try:
+        match = _MONTH_DAY_RE.fullmatch(date_str)
+        if match:
+            month = _MONTHS.get(match.group(1).lower())
+            if month:
+                year = int(match.group(3)) if match.group(3) else datetime.now().year
+                return date(year, month, int(match.group(2))).isoformat()
+        
+        match = _NUMERIC_DATE_RE.fullmatch(date_str)
+        if match:
+            year = int(match.group(3))
+            if year < 100:  # strptime's %y pivot: 69-99 -> 19xx, 00-68 -> 20xx
+                year += 1900 if year >= 69 else 2000
+            return date(year, int(match.group(1)), int(match.group(2))).isoformat()
+    except ValueError:  # out-of-range month/day
+        pass
             
     return date_str # Return as is if unknown
 
@@ -56,6 +74,6 @@ def sanitize_player_name(name):
         return ""
     # Remove suffixes, extra spaces, and special characters
     name = name.lower()
-    name = re.sub(r'\s+', ' ', name).strip()
-    name = re.sub(r'[^a-z\s-]', '', name)
+    name = _WS_RE.sub(' ', name).strip()
+    name = _ALPHA_RE.sub('', name)
     return name
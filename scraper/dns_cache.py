@@ -0,0 +1,94 @@
+"""
+DNS cache for a requests session, installed through its HTTPAdapter.
+
+Every new urllib3 connection normally does a fresh getaddrinfo. Roster fetches
+hit the same few athletics hosts over and over, so the resolved address list is
+kept for DNS_CACHE_TTL seconds instead. Like urllib3 itself, each address is
+tried in order until one connects. TLS still uses the original hostname for
+SNI and certificate checks; only the socket connect goes to the cached IPs.
+
+Only sessions that mount CachedDNSAdapter are affected; urllib3 is not patched.
+"""
+
+import socket
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import create_connection
+
+DNS_CACHE_TTL = 300  # seconds
+
+# (host, port) -> (expires_at, [ip, ...]) in getaddrinfo order
+_dns_cache = {}
+
+
+def _resolve(host, port):
+    """Return the cached addresses for host, resolving them if missing or expired."""
+    entry = _dns_cache.get((host, port))
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    ips = list(dict.fromkeys(info[4][0] for info in infos))
+    _dns_cache[(host, port)] = (time.monotonic() + DNS_CACHE_TTL, ips)
+    return ips
+
+
+class _CachedDNSMixin:
+    """urllib3 connection whose connect walks the cached address list."""
+
+    def _new_conn(self):
+        try:
+            ips = _resolve(self._dns_host, self.port)
+        except OSError:
+            # Let urllib3 resolve (and report the failure) itself
+            return super()._new_conn()
+
+        error = None
+        for ip in ips:
+            try:
+                # An IP literal resolves locally; create_connection still applies
+                # urllib3's timeout handling and socket options
+                return create_connection(
+                    (ip, self.port), self.timeout,
+                    source_address=self.source_address,
+                    socket_options=self.socket_options,
+                )
+            except OSError as e:
+                error = e
+
+        # Every address failed; they may have moved, so re-resolve next time
+        _dns_cache.pop((self._dns_host, self.port), None)
+        if isinstance(error, socket.timeout):
+            raise ConnectTimeoutError(
+                self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})"
+            ) from error
+        raise NewConnectionError(self, f"Failed to establish a new connection: {error}") from error
+
+
+class _CachedHTTPConnection(_CachedDNSMixin, HTTPConnection):
+    pass
+
+
+class _CachedHTTPSConnection(_CachedDNSMixin, HTTPSConnection):
+    pass
+
+
+class _CachedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedHTTPConnection
+
+
+class _CachedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedHTTPSConnection
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections resolve hosts through the DNS cache."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CachedHTTPConnectionPool,
+            "https": _CachedHTTPSConnectionPool,
+        }
@@ -1,12 +1,30 @@
+import asyncio
+import functools
 import logging
-import json
+import random
+import threading
 import traceback
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 import os
+import aiohttp
+import orjson
 
 logger = logging.getLogger(__name__)
 
-ERROR_LOG_PATH = "output/scraper_errors.json"
+# One JSON object per line; compacted back to the last MAX_LOGGED_ERRORS
+# entries once the file has grown to twice that
+ERROR_LOG_PATH = "output/scraper_errors.jsonl"
+MAX_LOGGED_ERRORS = 100
+
+_recent_errors = deque(maxlen=MAX_LOGGED_ERRORS)
+_log_state = {"lines_on_disk": None}  # None until the existing log is loaded
+_log_lock = threading.Lock()  # log_error is called from scraper worker threads
+
+# Statuses worth retrying: throttling and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
 
 class ScraperError(Exception):
     """Base class for scraper exceptions"""
@@ -17,8 +35,13 @@ class ScraperError(Exception):
         self.url = url
         self.timestamp = datetime.now().isoformat()
 
-def log_error(error):
-    """Logs structured error information to a file"""
+@lru_cache(maxsize=None)
+def _ensure_dir(path):
+    """Create a directory once per process instead of on every write"""
+    os.makedirs(path, exist_ok=True)
+
+def _error_record(error):
+    """Build the structured log entry; must run in the thread handling the exception"""
     error_data = {
         "timestamp": datetime.now().isoformat(),
         "message": str(error),
@@ -29,36 +52,94 @@ def log_error(error):
     }
     
     logger.error(f"Scraper Error: {error_data['message']} | School: {error_data['school']}")
-    
-    # Append to JSON log file
-    os.makedirs(os.path.dirname(ERROR_LOG_PATH), exist_ok=True)
+    return error_data
+
+def log_error(error):
+    """Logs structured error information to a file"""
+    _write_error(_error_record(error))
+
+async def alog_error(error):
+    """log_error for coroutines: the file write runs in a thread, not on the loop"""
+    await asyncio.to_thread(_write_error, _error_record(error))
+
+def _write_error(error_data):
+    """Append one entry to the JSONL log, compacting it when it grows too long"""
+    # Append to JSONL log file
+    _ensure_dir(os.path.dirname(ERROR_LOG_PATH))
     
     try:
-        errors = []
-        if os.path.exists(ERROR_LOG_PATH):
-            with open(ERROR_LOG_PATH, 'r') as f:
-                errors = json.load(f)
-        
-        errors.append(error_data)
-        
-        # Keep only last 100 errors
-        errors = errors[-100:]
-        
-        with open(ERROR_LOG_PATH, 'w') as f:
-            json.dump(errors, f, indent=4)
+        with _log_lock:
+            if _log_state["lines_on_disk"] is None:
+                _load_recent_errors()
+            _recent_errors.append(error_data)
+            
+            if _log_state["lines_on_disk"] >= 2 * MAX_LOGGED_ERRORS:
+                # Keep only last 100 errors
+                with open(ERROR_LOG_PATH, 'wb') as f:
+                    f.write(b''.join(orjson.dumps(e) + b'\n' for e in _recent_errors))
+                _log_state["lines_on_disk"] = len(_recent_errors)
+            else:
+                with open(ERROR_LOG_PATH, 'ab') as f:
+                    f.write(orjson.dumps(error_data) + b'\n')
+                _log_state["lines_on_disk"] += 1
     except Exception as e:
         logger.error(f"Failed to write to error log: {e}")
 
-def handle_retry(func):
-    """Decorator to retry functions on failure"""
-    def wrapper(*args, **kwargs):
-        retries = 3
-        for i in range(retries):
-            try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                if i == retries - 1:
-                    log_error(e)
-                    raise
-                logger.warning(f"Retry {i+1}/{retries} for {func.__name__}")
-    return wrapper
+def _load_recent_errors():
+    """Seed the in-memory window from an existing log file (once per process)."""
+    lines = 0
+    try:
+        with open(ERROR_LOG_PATH, 'rb') as f:
+            for line in f:
+                lines += 1
+                try:
+                    _recent_errors.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    pass
+    except FileNotFoundError:
+        pass
+    _log_state["lines_on_disk"] = lines
+
+def retry_after_seconds(headers, cap=None):
+    """Parse a Retry-After header (delta-seconds or HTTP date), clamped to [0, cap]; None if absent or invalid."""
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    delay = max(0.0, delay)
+    return min(delay, cap) if cap is not None else delay
+
+def async_retry(attempts=3, start_timeout=0.5, default=None):
+    """
+    Retry a fetch coroutine called as func(session, url, ...) without blocking the loop.
+
+    Connection errors, timeouts and RETRY_STATUSES responses are retried with
+    exponential backoff plus jitter, or after the server's Retry-After delay when
+    it sends one. Once attempts run out (or on any other HTTP
+    error) the failure goes to alog_error with the URL and `default` is returned.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(session, url, *args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return await func(session, url, *args, **kwargs)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRY_STATUSES
+                    if not retryable or attempt == attempts - 1:
+                        await alog_error(ScraperError(f"{func.__name__} failed after {attempt + 1} attempt(s): {e!r}", url=url))
+                        return default
+                    delay = retry_after_seconds(getattr(e, 'headers', None), cap=60.0) or start_timeout * 2 ** attempt + random.uniform(0, start_timeout)
+                    logger.warning("Retry %d/%d for %s in %.1fs: %r", attempt + 1, attempts, url, delay, e)
+                    await asyncio.sleep(delay)
+                except Exception as e:
+                    await alog_error(ScraperError(f"{func.__name__} failed: {e!r}", url=url))
+                    return default
+        return wrapper
+    return decorator
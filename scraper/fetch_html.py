@@ -4,15 +4,29 @@ HTML fetching module.
 Handles HTTP requests to retrieve webpage content.
 """
 
-import requests
+import asyncio
+import aiohttp
+from bs4 import BeautifulSoup
 from .config import USER_AGENT, REQUEST_TIMEOUT
+from .parse_sidearm import parse_game_stats
 
+HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    # No br: aiohttp decodes bodies itself and needs the Brotli package for that
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1"
+}
 
-def fetch_html(url: str) -> str:
+
+async def fetch_html(session: aiohttp.ClientSession, url: str) -> str:
     """
     Fetch HTML content from a URL.
     
     Args:
+        session: Shared aiohttp session (connections are reused across calls)
         url: The URL to fetch
         
     Returns:
@@ -21,34 +35,59 @@ def fetch_html(url: str) -> str:
     Raises:
         Exception: If the request fails or returns non-200 status
     """
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1"
-    }
-    
     try:
         print(f"Fetching: {url}")
-        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-        
-        # Check for successful response
-        if response.status_code != 200:
-            raise Exception(
-                f"Failed to fetch page. Status code: {response.status_code}. "
-                f"URL: {url}"
-            )
+        async with session.get(url, headers=HEADERS,
+                               timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)) as response:
+            # Check for successful response
+            if response.status != 200:
+                raise Exception(
+                    f"Failed to fetch page. Status code: {response.status}. "
+                    f"URL: {url}"
+                )
+            text = await response.text()
         
-        print(f"Successfully fetched {len(response.text)} characters")
-        return response.text
+        print(f"Successfully fetched {len(text)} characters")
+        return text
         
-    except requests.exceptions.Timeout:
+    except asyncio.TimeoutError:
         raise Exception(f"Request timed out after {REQUEST_TIMEOUT} seconds. URL: {url}")
     
-    except requests.exceptions.ConnectionError:
+    except aiohttp.ClientConnectionError:
         raise Exception(f"Connection error. Please check your internet connection. URL: {url}")
     
-    except requests.exceptions.RequestException as e:
+    except aiohttp.ClientError as e:
         raise Exception(f"Request failed: {str(e)}. URL: {url}")
+
+
+async def fetch_soup(session: aiohttp.ClientSession, url: str) -> BeautifulSoup:
+    """
+    Fetch a page and parse it off the event loop.
+    
+    The parse runs in a worker thread so it overlaps with other fetches
+    instead of stalling them.
+    """
+    html = await fetch_html(session, url)
+    return await asyncio.to_thread(BeautifulSoup, html, 'lxml')
+
+
+async def fetch_game_stats_many(urls, table_selector, concurrency=8):
+    """
+    Fetch and parse several Sidearm stats pages concurrently.
+    
+    Pages are fetched over one session (at most `concurrency` at a time) and
+    each is parsed with parse_game_stats in a worker thread, so downloads
+    overlap with the parsing of pages that already arrived.
+    
+    Returns:
+        List of game lists, one per URL (an Exception in place of a failed page)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async with aiohttp.ClientSession() as session:
+        async def fetch_and_parse(url):
+            async with semaphore:
+                html = await fetch_html(session, url)
+            return await asyncio.to_thread(parse_game_stats, html, table_selector)
+        
+        return await asyncio.gather(*(fetch_and_parse(url) for url in urls), return_exceptions=True)
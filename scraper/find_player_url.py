@@ -3,25 +3,172 @@ Find a player's individual page URL by searching the team roster.
 Supports multiple platforms: SIDEARM, PrestoSports, NCAA.com, and generic sites.
 """
 
+import os
+import re
+import threading
+import time
 import requests
+from requests_cache import CachedSession
 from bs4 import BeautifulSoup
-from .config import SCHOOLS, 
-get_platform_selectors, detect_platform, get_roster_urlimport re
+from selectolax.lexbor import LexborHTMLParser
+from .config import SCHOOLS, USER_AGENT, CACHE_DIR, get_platform_selectors, detect_platform, get_roster_url
+from .dns_cache import CachedDNSAdapter
+
+# Keep-alive session shared by every roster fetch so repeat visits to a
+# school's host reuse the TCP/TLS connection. Responses are also cached in
+# SQLite for an hour, so restarts and repeat runs skip the network entirely
+# (rosters change at most daily).
+_SESSION = CachedSession(
+    os.path.join(CACHE_DIR, "rosters"),
+    backend="sqlite",
+    expire_after=3600,
+    allowable_methods=("GET",),
+)
+# Roster fetches revisit the same hosts all run long; the adapter also skips
+# the repeat DNS lookups (for this session only)
+_SESSION.mount("https://", CachedDNSAdapter(pool_connections=16, pool_maxsize=32))
+_SESSION.mount("http://", CachedDNSAdapter(pool_connections=16, pool_maxsize=32))
+_SESSION.headers.update({
+    "User-Agent": USER_AGENT,
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+})
+
+# Parsed rosters are kept for about one scheduler cycle
+ROSTER_CACHE_TTL = 45 * 60  # seconds
+
+# (school, sport) -> (fetched_at, roster index)
+_roster_cache = {}
+# One lock per roster so concurrent lookups for the same school wait on a
+# single fetch instead of all downloading the page at once
+_roster_locks = {}
+
+_WS_RE = re.compile(r'\s+')
+
+
+def close_session():
+    """Close pooled roster connections (call on shutdown)."""
+    _SESSION.close()
 
 
 def normalize_name(name):
     """Normalize player name for matching (lowercase, remove extra spaces)."""
-    return re.sub(r'\s+', ' ', name.lower().strip())
+    return _WS_RE.sub(' ', name.casefold().strip())
+
+
+def _roster_cards_lexbor(html, selectors):
+    """Extract (name, jersey, href) for each roster card with selectolax."""
+    cards = []
+    for card in LexborHTMLParser(html).css(selectors["roster_card"]):
+        name_elem = card.css_first(selectors["player_name"])
+        if not name_elem:
+            cards.append(None)
+            continue
+        number_elem = card.css_first(selectors["player_number"])
+        
+        # Player's profile link: platform selector, then an enclosing <a>, then any <a>
+        link_elem = card.css_first(selectors["player_link"])
+        if not link_elem:
+            link_elem = card.parent
+            while link_elem is not None and link_elem.tag != 'a':
+                link_elem = link_elem.parent
+            link_elem = link_elem or card.css_first('a')
+        
+        cards.append((
+            name_elem.text(),
+            number_elem.text().strip() if number_elem else "",
+            link_elem.attributes.get('href') if link_elem else None,
+        ))
+    return cards
+
+
+def _roster_cards_soup(html, selectors):
+    """BeautifulSoup equivalent of _roster_cards_lexbor, for pages lexbor can't read."""
+    cards = []
+    for card in BeautifulSoup(html, 'lxml').select(selectors["roster_card"]):
+        name_elem = card.select_one(selectors["player_name"])
+        if not name_elem:
+            cards.append(None)
+            continue
+        number_elem = card.select_one(selectors["player_number"])
+        
+        link_elem = card.select_one(selectors["player_link"])
+        if not link_elem:
+            link_elem = card.find_parent('a') or card.find('a')
+        
+        cards.append((
+            name_elem.get_text(),
+            number_elem.get_text().strip() if number_elem else "",
+            link_elem.get('href') if link_elem else None,
+        ))
+    return cards
+
+
+def _build_roster_index(html, roster_url, domain, selectors):
+    """
+    Parse a roster page once into lookup tables.
+    
+    Returns a dict with:
+        by_key: (normalized_name, jersey) -> player URL
+        by_number: jersey -> [(normalized_name, player URL), ...]
+        by_name: normalized_name -> player URL (for number mismatches)
+        count: number of player cards on the page
+    """
+    player_cards = _roster_cards_lexbor(html, selectors) or _roster_cards_soup(html, selectors)
+    by_key = {}
+    by_number = {}
+    by_name = {}
+    
+    for card in player_cards:
+        if not card or not card[2]:
+            continue
+        raw_name, card_number, player_url = card
+        card_name = normalize_name(raw_name)
+        
+        # Make URL absolute if it's relative
+        if player_url.startswith('/'):
+            player_url = f"https://{domain}" + player_url
+        elif not player_url.startswith('http'):
+            player_url = roster_url.rsplit('/', 1)[0] + '/' + player_url
+        
+        by_key.setdefault((card_name, card_number), player_url)
+        by_number.setdefault(card_number, []).append((card_name, player_url))
+        by_name.setdefault(card_name, player_url)
+    
+    return {"by_key": by_key, "by_number": by_number, "by_name": by_name, "count": len(player_cards)}
+
+
+def _get_roster_index(school, sport, roster_url, domain, selectors):
+    """Return the cached roster index for a school, fetching it at most once per TTL."""
+    key = (school, sport)
+    lock = _roster_locks.setdefault(key, threading.Lock())
+    
+    with lock:
+        cached = _roster_cache.get(key)
+        if cached and time.monotonic() - cached[0] < ROSTER_CACHE_TTL:
+            return cached[1]
+        
+        # Fetch the roster page
+        try:
+            response = _SESSION.get(roster_url, timeout=10)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise ValueError(f"Failed to fetch roster from {roster_url}: {str(e)}")
+        
+        index = _build_roster_index(response.content, roster_url, domain, selectors)
+        _roster_cache[key] = (time.monotonic(), index)
+        return index
 
 
-def find_player_url(player_name, jersey_number, school, sport="baseball"):    """
+def find_player_url(player_name, jersey_number, school, sport="baseball"):
+    """
     Find a player's individual page URL from the roster.
     
     Args:
         player_name (str): Player's full name (e.g., "Charlie Davis")
         jersey_number (str or int): Jersey number (e.g., "8" or 8)
         school (str): School name (e.g., "Belmont")
-                sport (str): Sport name ("baseball" or "softball", default: "baseball")
+        sport (str): Sport name ("baseball" or "softball", default: "baseball")
     
     Returns:
         tuple: (player_url, platform_type) or (None, None) if not found
@@ -34,71 +181,41 @@ def find_player_url(player_name, jersey_number, school, sport="baseball"):    ""
     if not school_config:
         raise ValueError(f"School '{school}' not found in configuration. Available schools: {list(SCHOOLS.keys())}")
     
-    roster_url = school_config["roster_url"]
-    platform_type = school_config.get("type", "generic")
+    roster_url = get_roster_url(school, sport)
     
     # Auto-detect platform if not specified
-    roster_url = get_roster_url(school, sport)        platform_type = detect_platform(school_config["domain"])
+    platform_type = school_config.get("type") or detect_platform(school_config["domain"])
     
     # Get platform-specific selectors
     selectors = get_platform_selectors(platform_type)
     
-    # Fetch the roster page
-    try:
-        response = requests.get(roster_url, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        raise ValueError(f"Failed to fetch roster from {roster_url}: {str(e)}")
+    # Roster is fetched and parsed once per school, then shared by every player lookup
+    roster = _get_roster_index(school, sport, roster_url, school_config["domain"], selectors)
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    if not roster["count"]:
+        raise ValueError(f"No players found on roster page {roster_url}. Check platform selectors for '{platform_type}'.")
     
     # Normalize inputs
     normalized_player = normalize_name(player_name)
     jersey_str = str(jersey_number).strip()
     
-    # Find all player cards/rows on the roster
-    player_cards = soup.select(selectors["roster_card"])
+    # Exact name + number hit
+    player_url = roster["by_key"].get((normalized_player, jersey_str))
+    if player_url:
+        return player_url, platform_type
     
-    if not player_cards:
-        raise ValueError(f"No players found on roster page {roster_url}. Check platform selectors for '{platform_type}'.")
+    # Match by number AND partial name for accuracy
+    for card_name, player_url in roster["by_number"].get(jersey_str, ()):
+        if normalized_player in card_name or card_name in normalized_player:
+            return player_url, platform_type
     
-    # Search for the player
-    for card in player_cards:
-        # Extract player name
-        name_elem = card.select_one(selectors["player_name"])
-        if not name_elem:
-            continue
-        
-        card_name = normalize_name(name_elem.get_text())
-        
-        # Extract jersey number
-        number_elem = card.select_one(selectors["player_number"])
-        card_number = number_elem.get_text().strip() if number_elem else ""
-        
-        # Match by name AND number for accuracy
-        name_match = normalized_player in card_name or card_name in normalized_player
-        number_match = jersey_str == card_number
-        
-        if name_match and number_match:
-            # Find the player's profile link
-            link_elem = card.select_one(selectors["player_link"])
-            if not link_elem:
-                link_elem = card.find_parent('a') or card.find('a')
-            
-            if link_elem and link_elem.get('href'):
-                player_url = link_elem['href']
-                
-                # Make URL absolute if it's relative
-                if player_url.startswith('/'):
-                    base_url = f"https://{school_config['domain']}"
-                    player_url = base_url + player_url
-                elif not player_url.startswith('http'):
-                    player_url = roster_url.rsplit('/', 1)[0] + '/' + player_url
-                
-                return player_url, platform_type
+    # Exact full-name hit when the listed number differs (e.g. a mid-season number change)
+    player_url = roster["by_name"].get(normalized_player)
+    if player_url:
+        return player_url, platform_type
     
     # Player not found
     raise ValueError(
         f"Player '{player_name}' (#{jersey_number}) not found on {school} roster. "
-        f"Found {len(player_cards)} players on page. Check spelling and number."
+        f"Found {roster['count']} players on page. Check spelling and number."
     )
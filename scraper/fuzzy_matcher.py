@@ -1,41 +1,160 @@
 import re
-from typing import List, Optional
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+from rapidfuzz import fuzz, process
+
+_SUFFIX_RE = re.compile(r'\s+(jr|sr|iii|iv|v)\.?$', re.IGNORECASE)
+# Deletes every ASCII character except letters and whitespace (names are ASCII-folded first)
+_NONALPHA_TABLE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not (c.isalpha() or c.isspace())
+))
+
+# Minimum WRatio score (0-100) for a typo/variant match
+FUZZY_CUTOFF = 85
 
 def normalize_name(name: str) -> str:
-    \"\"\"Clean and normalize a player name for matching.\"\"\"
+    """Clean and normalize a player name for matching."""
     if not name:
-        return \"\"
+        return ""
+    # Fold accents to ASCII (José -> Jose) so they survive the letter filter below
+    if not name.isascii():
+        name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
     # Remove suffixes (Jr, Sr, III, etc)
-    name = re.sub(r'\\s+(jr|sr|iii|iv|v)\\.?$', '', name, flags=re.IGNORECASE)
+    name = _SUFFIX_RE.sub('', name)
     # Remove middle initials/names
     parts = name.split()
     if len(parts) > 2:
-        name = f\"{parts[0]} {parts[-1]}\"
+        name = f"{parts[0]} {parts[-1]}"
     # Remove special characters and lowercase
-    return re.sub(r'[^a-zA-Z\\s]', '', name).lower().strip()
+    return name.translate(_NONALPHA_TABLE).lower().strip()
 
 def names_match(name1: str, name2: str) -> bool:
-    \"\"\"Check if two names match using fuzzy/normalized comparison.\"\"\"
+    """Check if two names match using fuzzy/normalized comparison."""
     norm1 = normalize_name(name1)
     norm2 = normalize_name(name2)
     
     if norm1 == norm2:
         return True
         
-    # Handle first initial + last name (e.g., \"M. Smith\" vs \"Mike Smith\")
+    # Handle first initial + last name (e.g., "M. Smith" vs "Mike Smith")
     parts1 = norm1.split()
     parts2 = norm2.split()
     
     if len(parts1) == 2 and len(parts2) == 2:
         if parts1[1] == parts2[1]: # Last names match
-            if parts1[0][0] == parts2[0][0]: # First initials match
+            # Only when one side is a bare initial; "Jake" and "Jack" are different players
+            if min(len(parts1[0]), len(parts2[0])) == 1 and parts1[0][0] == parts2[0][0]:
                 return True
-                
+    
     return False
 
-def find_best_match(target_name: str, candidate_names: List[str]) -> Optional[str]:
-    \"\"\"Find the best matching name from a list of candidates.\"\"\"
+def build_candidate_index(candidate_names: List[str]) -> Tuple[Dict[str, str], Dict[Tuple[str, str], str], Dict[Tuple[str, str], str], List[str]]:
+    """
+    Normalize every candidate once and index it for matching.
+
+    Returns (exact_map, initial_last_map, bare_initial_map, normalized):
+    normalized name -> candidate, (first initial, last name) -> candidate for
+    two-part names, the same for candidates whose first name is a bare initial
+    ("M. Smith"), and the normalized names in candidate order for fuzzy
+    scoring. The first candidate wins on collisions, as with the old linear scan.
+    """
+    exact_map = {}
+    initial_last_map = {}
+    bare_initial_map = {}
+    normalized = []
     for candidate in candidate_names:
-        if names_match(target_name, candidate):
-            return candidate
+        norm = normalize_name(candidate)
+        normalized.append(norm)
+        exact_map.setdefault(norm, candidate)
+        parts = norm.split()
+        if len(parts) == 2:
+            initial_last_map.setdefault((parts[0][0], parts[1]), candidate)
+            if len(parts[0]) == 1:
+                bare_initial_map.setdefault((parts[0], parts[1]), candidate)
+    return exact_map, initial_last_map, bare_initial_map, normalized
+
+def _lookup_match(norm: str, exact_map, initial_last_map, bare_initial_map) -> Optional[str]:
+    """Exact, then first initial + last name, dict lookup for a normalized name."""
+    match = exact_map.get(norm)
+    if match is not None:
+        return match
+    
+    # Handle first initial + last name (e.g., "M. Smith" vs "Mike Smith"), as in
+    # names_match: one side must be a bare initial, so "Jake" never finds "Jack"
+    parts = norm.split()
+    if len(parts) == 2:
+        first, last = parts
+        if len(first) == 1:
+            return initial_last_map.get((first, last))
+        return bare_initial_map.get((first[0], last))
     return None
+
+def _namesake_indices(norm: str, normalized: List[str]) -> List[int]:
+    """
+    Candidates with the target's last name under a different full first name.
+    Those are teammates ("Jake Smith" / "Jack Smith"), not typos, so names_match
+    rejects them and fuzzy scoring must skip them too.
+    """
+    parts = norm.split()
+    if len(parts) != 2 or len(parts[0]) == 1:
+        return []
+    first, last = parts
+    indices = []
+    for i, candidate in enumerate(normalized):
+        candidate_parts = candidate.split()
+        if (len(candidate_parts) == 2 and candidate_parts[1] == last
+                and len(candidate_parts[0]) > 1 and candidate_parts[0] != first):
+            indices.append(i)
+    return indices
+
+def find_best_match(target_name: str, candidate_names: List[str], index=None) -> Optional[str]:
+    """
+    Find the best matching name from a list of candidates.
+
+    Exact and initial + last name matches are dict lookups; anything else
+    falls back to RapidFuzz scoring against every candidate. Pass an `index`
+    from build_candidate_index to reuse it across targets.
+    """
+    exact_map, initial_last_map, bare_initial_map, normalized = index or build_candidate_index(candidate_names)
+    norm = normalize_name(target_name)
+    
+    match = _lookup_match(norm, exact_map, initial_last_map, bare_initial_map)
+    if match is not None:
+        return match
+    
+    # Typos and spelling variants; with a dict of choices best[2] is still the index
+    skip = set(_namesake_indices(norm, normalized))
+    choices = {i: n for i, n in enumerate(normalized) if i not in skip} if skip else normalized
+    best = process.extractOne(norm, choices, scorer=fuzz.WRatio, score_cutoff=FUZZY_CUTOFF)
+    return candidate_names[best[2]] if best else None
+
+def find_best_matches(target_names: List[str], candidate_names: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Match many targets against the same candidates.
+
+    Everything is normalized once up front; targets without a dict hit are
+    then scored against all candidates in a single RapidFuzz cdist call
+    (C++, multi-threaded) instead of one Python-level call per target.
+    """
+    exact_map, initial_last_map, bare_initial_map, normalized = build_candidate_index(candidate_names)
+    results = {}
+    unmatched = []
+    
+    for target in target_names:
+        norm = normalize_name(target)
+        results[target] = _lookup_match(norm, exact_map, initial_last_map, bare_initial_map)
+        if results[target] is None:
+            unmatched.append((target, norm))
+    
+    if unmatched and normalized:
+        scores = process.cdist(
+            [norm for _, norm in unmatched], normalized,
+            scorer=fuzz.WRatio, score_cutoff=FUZZY_CUTOFF, workers=-1,
+        )
+        for (target, norm), row in zip(unmatched, scores):
+            row[_namesake_indices(norm, normalized)] = 0
+            best = int(row.argmax())
+            if row[best] > 0:
+                results[target] = candidate_names[best]
+    
+    return results
@@ -3,7 +3,21 @@ Parse individual player game logs using Selenium to handle dynamic content.
 Supports multiple platforms: SIDEARM (100% optimized), PrestoSports, NCAA.com, and generic sites.
 """
 
+import atexit
+import heapq
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so every driver gets a temp profile
+    fcntl = None
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -11,9 +25,95 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
-import time
 import re
-from .config import SELENIUM_HEADLESS, SELENIUM_TIMEOUT, DEFAULT_SEASON, get_platform_selectors
+from .config import (
+    SELENIUM_HEADLESS, SELENIUM_TIMEOUT, SELENIUM_GRID_URL, CHROMEDRIVER_PATH, DEFAULT_SEASON, USE_PLAYWRIGHT, CACHE_DIR,
+    get_platform_selectors,
+)
+
+# Tables inside the SIDEARM stats tab; the rest of the player page has others
+SIDEARM_STATS_TABLE_CSS = "#sidearm-roster-player-stats table"
+
+# Header words that mark a table as a game log in the generic parser
+_GAME_LOG_KEYWORDS = frozenset({'date', 'opponent', 'game'})
+
+# Third-party trackers/ads, web fonts and media that SIDEARM pages pull in;
+# none affect the stats table (images are already off via Chrome prefs)
+BLOCKED_URLS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*facebook.net*",
+    "*scorecardresearch.com*",
+    "*quantserve.com*",
+    "*hotjar.com*",
+    "*adservice.google.com*",
+]
+
+# Each local Chrome gets its own persistent profile (Chrome locks a profile to
+# one process). Slots are numbered so restarts pick the same directories up
+# again; a lock file per slot keeps concurrent processes off each other's
+# profiles, and a dead driver's slot goes back on the free list for reuse.
+MAX_PROFILE_SLOTS = 32
+_free_profile_slots = []  # heap of released slot numbers
+_next_profile_slot = 0
+_profile_lock = threading.Lock()
+# driver -> (profile_dir, lock_file or None for a throwaway temp profile)
+_driver_profiles = {}
+
+
+def _lock_profile_slot(slot):
+    """Take the slot's lock file without blocking; None if another process holds it."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    lock_file = open(os.path.join(CACHE_DIR, f"chrome-profile-{slot}.lock"), "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def _acquire_profile():
+    """Return (profile_dir, lock_file) for a free slot, or a temp profile when none is free."""
+    global _next_profile_slot
+    if fcntl is not None:
+        skipped = []
+        with _profile_lock:
+            try:
+                while True:
+                    if _free_profile_slots:
+                        slot = heapq.heappop(_free_profile_slots)
+                    elif _next_profile_slot < MAX_PROFILE_SLOTS:
+                        slot = _next_profile_slot
+                        _next_profile_slot += 1
+                    else:
+                        break
+                    lock_file = _lock_profile_slot(slot)
+                    if lock_file is not None:
+                        return os.path.abspath(os.path.join(CACHE_DIR, f"chrome-profile-{slot}")), lock_file
+                    skipped.append(slot)  # in use by another process
+            finally:
+                for slot in skipped:
+                    heapq.heappush(_free_profile_slots, slot)
+    # Every slot is taken (or there's no flock here): use a fresh profile that
+    # is deleted with its driver
+    return tempfile.mkdtemp(prefix="chrome-profile-"), None
+
+
+def _release_profile(profile):
+    """Unlock a slot profile and put it back on the free list, or delete a temp one."""
+    profile_dir, lock_file = profile
+    if lock_file is None:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        return
+    slot = int(profile_dir.rsplit("-", 1)[1])
+    lock_file.close()  # drops the flock
+    with _profile_lock:
+        heapq.heappush(_free_profile_slots, slot)
 
 
 def setup_driver():
@@ -29,12 +129,120 @@ def setup_driver():
     chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    # Stats pages don't need images or notification prompts
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    
+    if SELENIUM_GRID_URL:
+        # Browsers live on the grid's nodes, so concurrency isn't capped by this host
+        return webdriver.Remote(command_executor=SELENIUM_GRID_URL, options=chrome_options)
+    
+    # Persistent profile keeps the HTTP cache and cookies warm between drivers and runs
+    profile = _acquire_profile()
+    chrome_options.add_argument(f'--user-data-dir={profile[0]}')
+    
+    try:
+        service = Service(_chromedriver_path())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    except Exception:
+        _release_profile(profile)
+        raise
+    with _profile_lock:
+        _driver_profiles[driver] = profile
+    
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
     
     return driver
 
 
+def _quit_driver(driver):
+    """Quit a driver and free its browser profile."""
+    try:
+        driver.quit()
+    except WebDriverException:
+        pass
+    with _profile_lock:
+        profile = _driver_profiles.pop(driver, None)
+    if profile is not None:
+        _release_profile(profile)
+
+
+@lru_cache(maxsize=1)
+def _chromedriver_path():
+    """Resolve (and download if needed) chromedriver once per process."""
+    if CHROMEDRIVER_PATH:
+        return CHROMEDRIVER_PATH
+    return ChromeDriverManager().install()
+
+
+# Idle warm drivers. Chrome takes seconds to start, so each scrape checks one
+# out and returns it rather than launching and quitting a browser per player.
+_driver_pool = queue.LifoQueue()
+_all_drivers = []
+_drivers_lock = threading.Lock()
+
+
+def get_driver():
+    """Check out an idle driver from the pool, starting a new one if none is free."""
+    try:
+        return _driver_pool.get_nowait()
+    except queue.Empty:
+        driver = setup_driver()
+        with _drivers_lock:
+            _all_drivers.append(driver)
+        return driver
+
+
+def release_driver(driver):
+    """Return a driver to the pool, or quit it if its browser session has died."""
+    try:
+        driver.current_url  # cheap round-trip to check the session is alive
+    except WebDriverException:
+        with _drivers_lock:
+            if driver in _all_drivers:
+                _all_drivers.remove(driver)
+        _quit_driver(driver)
+        return
+    _driver_pool.put(driver)
+
+
+@atexit.register
+def quit_drivers():
+    """Quit every driver the pool has started."""
+    with _drivers_lock:
+        drivers = list(_all_drivers)
+        _all_drivers.clear()
+    while True:
+        try:
+            _driver_pool.get_nowait()
+        except queue.Empty:
+            break
+    for driver in drivers:
+        _quit_driver(driver)
+
+
+def warm_drivers(count):
+    """Start `count` drivers in parallel and park them in the pool."""
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        drivers = list(executor.map(lambda _: setup_driver(), range(count)))
+    with _drivers_lock:
+        _all_drivers.extend(drivers)
+    for driver in drivers:
+        _driver_pool.put(driver)
+
+
+def _wait_for_table(driver, css="table", timeout=SELENIUM_TIMEOUT):
+    """Block until a table matching css is in the DOM (or the timeout passes)."""
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, css)))
+    except TimeoutException:
+        pass  # No table on the page; the parser will report an empty log
+
+
 def parse_sidearm_game_log(driver, player_url, season=DEFAULT_SEASON):
     """
     Parse game log from SIDEARM Sports sites (100% optimized for accuracy).
@@ -43,30 +251,37 @@ def parse_sidearm_game_log(driver, player_url, season=DEFAULT_SEASON):
     driver.get(player_url)
     wait = WebDriverWait(driver, SELENIUM_TIMEOUT)
     
-    # Wait for page to load
-    time.sleep(2)
-    
-    # Click on Stats tab
+    # Click on Stats tab (the wait doubles as the page-load wait)
     try:
         stats_tab = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "a[href*='#sidearm-roster-player-stats']")))
         driver.execute_script("arguments[0].click();", stats_tab)
-        time.sleep(2)
+        _wait_for_table(driver, SIDEARM_STATS_TABLE_CSS)
     except Exception as e:
         raise ValueError(f"Could not find or click Stats tab on SIDEARM page: {str(e)}")
     
-    # Select season
-    try:
-        season_dropdown = driver.find_element(By.CSS_SELECTOR, "select")
+    # Select season (no selector when only one season is available)
+    for season_dropdown in driver.find_elements(By.CSS_SELECTOR, "select")[:1]:
         for option in season_dropdown.find_elements(By.TAG_NAME, "option"):
             if season in option.text:
+                # Grab the current stats table, if any, so the re-render can be
+                # detected; a missing table must not stop the option being clicked
+                old_tables = driver.find_elements(By.CSS_SELECTOR, SIDEARM_STATS_TABLE_CSS)
                 option.click()
-                time.sleep(2)
+                if old_tables:
+                    try:
+                        WebDriverWait(driver, 3).until(EC.staleness_of(old_tables[0]))
+                    except TimeoutException:
+                        pass  # Already showing this season
+                _wait_for_table(driver, SIDEARM_STATS_TABLE_CSS)
                 break
-    except:
-        pass  # Season selector might not exist if only one season available
     
     # Get page HTML after JavaScript has loaded
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    return extract_sidearm_game_log(driver.page_source, season)
+
+
+def extract_sidearm_game_log(html, season=DEFAULT_SEASON):
+    """Pull the game-by-game rows out of a rendered SIDEARM stats page."""
+    soup = BeautifulSoup(html, 'lxml')
     
     # Find the game-by-game stats table
     game_log = []
@@ -77,8 +292,9 @@ def parse_sidearm_game_log(driver, player_url, season=DEFAULT_SEASON):
     for table in tables:
         # Check if this is the game log table (has "Date" and "Opponent" headers)
         headers = [th.get_text().strip() for th in table.find_all('th')]
+        headers_set = {h.lower() for h in headers}
         
-        if 'Date' in headers and 'Opponent' in headers:
+        if 'date' in headers_set and 'opponent' in headers_set:
             # Found the game log table!
             rows = table.find_all('tr')[1:]  # Skip header row
             
@@ -108,17 +324,16 @@ def parse_prestosports_game_log(driver, player_url, season=DEFAULT_SEASON):
     """
     driver.get(player_url)
     wait = WebDriverWait(driver, SELENIUM_TIMEOUT)
-    time.sleep(2)
     
     # Try to click stats tab
     try:
         stats_tab = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "a[href*='stats'], #stats-tab")))
         stats_tab.click()
-        time.sleep(2)
     except:
         pass  # Stats might be default view
+    _wait_for_table(driver)
     
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    soup = BeautifulSoup(driver.page_source, 'lxml')
     game_log = []
     
     # Find stats table
@@ -126,8 +341,9 @@ def parse_prestosports_game_log(driver, player_url, season=DEFAULT_SEASON):
     
     for table in tables:
         headers = [th.get_text().strip() for th in table.find_all('th')]
+        headers_set = {h.lower() for h in headers}
         
-        if 'Date' in headers or 'Opponent' in headers:
+        if 'date' in headers_set or 'opponent' in headers_set:
             rows = table.find_all('tr')[1:]
             
             for row in rows:
@@ -152,9 +368,9 @@ def parse_generic_game_log(driver, player_url, season=DEFAULT_SEASON):
     Falls back to this if platform-specific parser fails.
     """
     driver.get(player_url)
-    time.sleep(3)
+    _wait_for_table(driver)
     
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    soup = BeautifulSoup(driver.page_source, 'lxml')
     game_log = []
     
     # Find any table that looks like game log
@@ -162,9 +378,13 @@ def parse_generic_game_log(driver, player_url, season=DEFAULT_SEASON):
     
     for table in tables:
         headers = [th.get_text().strip() for th in table.find_all('th')]
+        headers_set = {h.lower() for h in headers}
         
-        # Check if this looks like a game log table
-        if any(keyword in ' '.join(headers).lower() for keyword in ['date', 'opponent', 'game']):
+        # Check if this looks like a game log table: exact header hit first,
+        # then keywords inside longer headers (e.g. "Game Date")
+        if not _GAME_LOG_KEYWORDS.isdisjoint(headers_set) or any(
+            keyword in header for header in headers_set for keyword in _GAME_LOG_KEYWORDS
+        ):
             rows = table.find_all('tr')[1:]
             
             for row in rows:
@@ -193,7 +413,14 @@ def parse_game_log(player_url, platform_type, season=DEFAULT_SEASON):
     Returns:
         list: List of game dictionaries with stats
     """
-    driver = setup_driver()
+    if USE_PLAYWRIGHT and platform_type == 'sidearm':
+        from .parse_game_log_playwright import parse_sidearm_game_log_playwright
+        try:
+            return parse_sidearm_game_log_playwright(player_url, season)
+        except Exception as e:
+            print(f"Playwright parser failed, falling back to Selenium: {str(e)}")
+    
+    driver = get_driver()
     
     try:
         # Route to platform-specific parser
@@ -220,4 +447,33 @@ def parse_game_log(player_url, platform_type, season=DEFAULT_SEASON):
             raise ValueError(f"Failed to parse game log from {player_url}: {str(e)}")
     
     finally:
-        driver.quit()
+        release_driver(driver)
+
+
+def scrape_game_logs(player_urls, platform_types, season=DEFAULT_SEASON, concurrency=4):
+    """
+    Parse many game logs concurrently, one pooled driver per worker.
+    
+    Args:
+        player_urls (list): Player profile URLs
+        platform_types (list): Platform type for each URL (same order)
+        season (str): Season to scrape (e.g., '2026')
+        concurrency (int): Number of browsers driven at once
+    
+    Returns:
+        list: One entry per URL, in order - the game log list, or the
+        exception raised while parsing it
+    """
+    def scrape_one(args):
+        try:
+            return parse_game_log(*args, season)
+        except Exception as e:
+            return e
+    
+    # Browser startup dominates a cold run, so bring the drivers up together
+    missing = concurrency - _driver_pool.qsize()
+    if missing > 0:
+        warm_drivers(missing)
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(scrape_one, zip(player_urls, platform_types)))
@@ -0,0 +1,66 @@
+"""
+Parse SIDEARM player game logs with Playwright instead of Selenium.
+Enabled with USE_PLAYWRIGHT; every action auto-waits, so there are no fixed sleeps.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from playwright.sync_api import sync_playwright
+from .config import DEFAULT_SEASON, PLAYWRIGHT_WORKERS, SELENIUM_HEADLESS, SELENIUM_TIMEOUT, USER_AGENT
+from .parse_game_log import SIDEARM_STATS_TABLE_CSS, extract_sidearm_game_log
+
+# Playwright's sync objects only work on the thread that created them, so the
+# browsers live on these long-lived worker threads (one Chromium each) instead
+# of the short-lived scrape threads that call in
+_executor = ThreadPoolExecutor(max_workers=PLAYWRIGHT_WORKERS, thread_name_prefix="playwright")
+_local = threading.local()
+
+TIMEOUT_MS = SELENIUM_TIMEOUT * 1000
+
+
+def _get_context():
+    """This worker thread's browser context, launched on first use."""
+    context = getattr(_local, "context", None)
+    if context is None:
+        _local.playwright = sync_playwright().start()
+        _local.browser = _local.playwright.chromium.launch(headless=SELENIUM_HEADLESS)
+        context = _local.browser.new_context(user_agent=USER_AGENT)
+        context.set_default_timeout(TIMEOUT_MS)
+        _local.context = context
+    return context
+
+
+def _scrape_sidearm(player_url, season):
+    """Load a SIDEARM player page, open its stats for `season`, and parse the game log."""
+    page = _get_context().new_page()
+    try:
+        page.goto(player_url)
+        
+        # Click on Stats tab
+        try:
+            page.click("a[href*='#sidearm-roster-player-stats']")
+            page.wait_for_selector(SIDEARM_STATS_TABLE_CSS)
+        except Exception as e:
+            raise ValueError(f"Could not find or click Stats tab on SIDEARM page: {str(e)}")
+        
+        # Select season (the selector might not exist if only one season is available)
+        if page.query_selector("select"):
+            labels = page.eval_on_selector("select", "s => Array.from(s.options, o => o.text)")
+            for index, label in enumerate(labels):
+                if season in label:
+                    page.select_option("select", index=index)
+                    page.wait_for_load_state("networkidle")
+                    break
+        
+        return extract_sidearm_game_log(page.content(), season)
+    finally:
+        page.close()
+
+
+def parse_sidearm_game_log_playwright(player_url, season=DEFAULT_SEASON):
+    """
+    Playwright version of parse_sidearm_game_log.
+    
+    Safe to call from any thread; the work runs on a Playwright worker.
+    """
+    return _executor.submit(_scrape_sidearm, player_url, season).result()
@@ -7,8 +7,16 @@ Extracts game-by-game statistics from HTML tables.
 from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 import re
+from functools import lru_cache
 from .utils import clean_text, parse_date, extract_home_away
 
+_CELL_TAGS = ('td', 'th')
+
+
+def _cells(row) -> List:
+    """Direct td/th children of a row; cheaper than a recursive find_all walk."""
+    return [c for c in row.children if c.name in _CELL_TAGS]
+
 
 def parse_game_stats(html: str, table_selector: Dict) -> List[Dict]:
     """
@@ -35,12 +43,16 @@ def parse_game_stats(html: str, table_selector: Dict) -> List[Dict]:
     headers = []
     header_row = table.find('thead')
     if header_row:
-        headers = [clean_text(th.get_text()) for th in header_row.find_all('th')]
+        # With several thead rows (group labels above the columns), the last
+        # one holds the column labels
+        header_trs = header_row.find_all('tr')
+        header_cells = _cells(header_trs[-1]) if header_trs else header_row.find_all('th')
+        headers = [clean_text(th.get_text()) for th in header_cells]
     else:
         # Try first row if no thead
         first_row = table.find('tr')
         if first_row:
-            headers = [clean_text(th.get_text()) for th in first_row.find_all(['th', 'td'])]
+            headers = [clean_text(th.get_text()) for th in _cells(first_row)]
     
     if not headers:
         print("Warning: Could not find table headers")
@@ -54,7 +66,7 @@ def parse_game_stats(html: str, table_selector: Dict) -> List[Dict]:
     # Find data rows (skip header rows)
     tbody = table.find('tbody')
     if tbody:
-        rows = tbody.find_all('tr')
+        rows = [r for r in tbody.children if r.name == 'tr']
     else:
         rows = table.find_all('tr')[1:]  # Skip first row if no tbody
     
@@ -62,7 +74,7 @@ def parse_game_stats(html: str, table_selector: Dict) -> List[Dict]:
     
     # Parse each row
     for row in rows:
-        cells = row.find_all(['td', 'th'])
+        cells = _cells(row)
         if len(cells) < 2:
             continue  # Skip empty or invalid rows
         
@@ -76,6 +88,45 @@ def parse_game_stats(html: str, table_selector: Dict) -> List[Dict]:
     return games
 
 
+# Common mappings (case-insensitive)
+COLUMN_VARIANTS = {
+    'date': ['date', 'dt'],
+    'opponent': ['opponent', 'opp', 'vs'],
+    'result': ['result', 'score', 'w/l'],
+    'ab': ['ab', 'at-bats'],
+    'h': ['h', 'hits'],
+    'r': ['r', 'runs'],
+    'rbi': ['rbi', "rbi's"],
+    'bb': ['bb', 'walks'],
+    'k': ['k', 'so', 'strikeouts'],
+    'tb': ['tb', 'total bases'],
+    'player': ['player', 'name'],
+    'number': ['#', 'no', 'num', 'jersey'],
+    # Pitching stats
+    'ip': ['ip', 'innings'],
+    'h_allowed': ['h', 'hits allowed'],
+    'er': ['er', 'earned runs'],
+}
+
+# Exact header -> stat key; the first key listing a variant wins
+_VARIANT_TO_KEY = {}
+for _key, _variants in COLUMN_VARIANTS.items():
+    for _variant in _variants:
+        _VARIANT_TO_KEY.setdefault(_variant, _key)
+
+
+@lru_cache(maxsize=512)
+def _column_key(header_lower: str) -> Optional[str]:
+    """Stat key for a lowercased header: exact variant first, then substring match."""
+    key = _VARIANT_TO_KEY.get(header_lower)
+    if key:
+        return key
+    for key, variants in COLUMN_VARIANTS.items():
+        if any(v in header_lower for v in variants):
+            return key
+    return None
+
+
 def create_column_mapping(headers: List[str]) -> Dict[str, int]:
     """
     Map common stat abbreviations to column indices.
@@ -88,33 +139,10 @@ def create_column_mapping(headers: List[str]) -> Dict[str, int]:
     """
     col_map = {}
     
-    # Common mappings (case-insensitive)
-    mappings = {
-        'date': ['date', 'dt'],
-        'opponent': ['opponent', 'opp', 'vs'],
-        'result': ['result', 'score', 'w/l'],
-        'ab': ['ab', 'at-bats'],
-        'h': ['h', 'hits'],
-        'r': ['r', 'runs'],
-        'rbi': ['rbi', "rbi's"],
-        'bb': ['bb', 'walks'],
-        'k': ['k', 'so', 'strikeouts'],
-        'tb': ['tb', 'total bases'],
-        'player': ['player', 'name'],
-        'number': ['#', 'no', 'num', 'jersey'],
-        # Pitching stats
-        'ip': ['ip', 'innings'],
-        'h_allowed': ['h', 'hits allowed'],
-        'er': ['er', 'earned runs'],
-    }
-    
     for idx, header in enumerate(headers):
-        header_lower = header.lower().strip()
-        
-        for key, variants in mappings.items():
-            if header_lower in variants or any(v in header_lower for v in variants):
-                col_map[key] = idx
-                break
+        key = _column_key(header.lower().strip())
+        if key:
+            col_map[key] = idx
     
     return col_map
 
@@ -1,4 +1,6 @@
 import logging
+import re
+from functools import lru_cache
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,64 @@ PLATFORMS = {
     'd3sports': ['d3baseball.com', 'd3sports.com']
 }
 
+# Exact hostname -> platform; the first platform listing a domain wins,
+# matching the order of the substring scan below
+_DOMAIN_MAP = {}
+for _platform, _patterns in PLATFORMS.items():
+    for _pattern in _patterns:
+        _DOMAIN_MAP.setdefault(_pattern, _platform)
+
+# HTML footer/credit markers in priority order (first listed platform wins)
+_HTML_MARKERS = {
+    'sidearm sports': 'sidearm', 'sidearmstats': 'sidearm',
+    'prestosports': 'presto', 'presto stats': 'presto',
+    'genius sports': 'genius',
+    'wmt digital': 'wmt',
+    'stretch internet': 'stretch',
+    'statbroadcast': 'statbroadcast',
+}
+_MARKER_PRIORITY = list(dict.fromkeys(_HTML_MARKERS.values()))
+_MARKERS_PATTERN = '|'.join(re.escape(m) for m in _HTML_MARKERS)
+# str and bytes variants so pages are searched as-is, without a lowercased copy.
+# re.ASCII keeps case-folding to A-Z: Unicode folding would let "ſidearm" (long s)
+# match, and its .lower() is not a key of _HTML_MARKERS
+_MARKERS_RE = re.compile(_MARKERS_PATTERN, re.IGNORECASE | re.ASCII)
+_MARKERS_RE_BYTES = re.compile(_MARKERS_PATTERN.encode('ascii'), re.IGNORECASE)
+
+def _platform_from_html(html):
+    """Platform named by the page's markers, or None; one case-insensitive pass."""
+    if isinstance(html, bytes):
+        found = {m.decode('ascii').lower() for m in _MARKERS_RE_BYTES.findall(html)}
+    else:
+        found = {m.lower() for m in _MARKERS_RE.findall(html)}
+    if not found:
+        return None
+    platforms = {_HTML_MARKERS[m] for m in found}
+    return next(p for p in _MARKER_PRIORITY if p in platforms)
+
+def _lookup_domain(domain):
+    """Platform for a hostname or any parent domain of it (a.b.sidearmsports.com)."""
+    while domain:
+        platform = _DOMAIN_MAP.get(domain)
+        if platform:
+            return platform
+        domain = domain.partition('.')[2]
+    return None
+
+@lru_cache(maxsize=1024)
+def _platform_for_domain(domain):
+    """Platform implied by the hostname alone, or None; cached per host for the run."""
+    # Known hostnames and their subdomains: a few dict lookups
+    platform = _lookup_domain(domain.split(':', 1)[0])
+    if platform:
+        return platform
+    
+    # Check domain patterns
+    for platform, patterns in PLATFORMS.items():
+        if any(pattern in domain for pattern in patterns):
+            return platform
+    return None
+
 def detect_platform(url, html=None):
     """
     Detects the athletic platform (Sidearm, Presto, etc.) for a given school URL.
@@ -23,26 +83,15 @@ def detect_platform(url, html=None):
     parsed_url = urlparse(url)
     domain = parsed_url.netloc.lower()
     
-    # Check domain patterns
-    for platform, patterns in PLATFORMS.items():
-        if any(pattern in domain for pattern in patterns):
-            return platform
+    platform = _platform_for_domain(domain)
+    if platform:
+        return platform
     
     # Check HTML markers if available (more reliable for white-labeled domains)
     if html:
-        html_lower = html.lower()
-        if 'sidearm sports' in html_lower or 'sidearmstats' in html_lower:
-            return 'sidearm'
-        if 'prestosports' in html_lower or 'presto stats' in html_lower:
-            return 'presto'
-        if 'genius sports' in html_lower:
-            return 'genius'
-        if 'wmt digital' in html_lower:
-            return 'wmt'
-        if 'stretch internet' in html_lower:
-            return 'stretch'
-        if 'statbroadcast' in html_lower:
-            return 'statbroadcast'
+        platform = _platform_from_html(html)
+        if platform:
+            return platform
     
     # Check URL path patterns
     path = parsed_url.path.lower()
@@ -54,6 +103,7 @@ def detect_platform(url, html=None):
     # Default to generic if unknown
     return 'generic'
 
+@lru_cache(maxsize=1024)
 def get_base_url(url):
     """Extracts base URL (e.g., https://belmontbruins.com)"""
     parsed = urlparse(url)
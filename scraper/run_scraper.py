@@ -4,12 +4,28 @@ Can be run directly from command line or imported by Base44.
 """
 
 import sys
-import json
 import csv
+import orjson
 from pathlib import Path
 from .scraper_api import get_player_stats
 from .config import DEFAULT_SEASON
 
+# Output directories already created by this process
+_ensured_dirs = set()
+
+
+def _ensure_output_dir(output_dir):
+    """Create the output directory once per process, not on every save."""
+    if output_dir not in _ensured_dirs:
+        Path(output_dir).mkdir(exist_ok=True)
+        _ensured_dirs.add(output_dir)
+
+
+def _player_stem(result):
+    """File name stem for a player result: <player_name>_<school>_<season>."""
+    player_name_clean = result['player_name'].replace(' ', '_').lower()
+    return f"{player_name_clean}_{result['school'].lower()}_{result['season']}"
+
 
 def save_to_csv(result, output_dir="output"):
     """Save game stats to CSV file."""
@@ -18,28 +34,34 @@ def save_to_csv(result, output_dir="output"):
         return None
     
     # Create output directory if it doesn't exist
-    Path(output_dir).mkdir(exist_ok=True)
+    _ensure_output_dir(output_dir)
     
     # Create filename
-    player_name_clean = result['player_name'].replace(' ', '_').lower()
-    filename = f"{output_dir}/{player_name_clean}_{result['school'].lower()}_{result['season']}.csv"
+    filename = f"{output_dir}/{_player_stem(result)}.csv"
     
     if not result['games']:
         print(f"No games to save for {result['player_name']}")
         return None
     
+    # Columns in the first game's order; keys only later games have are appended
+    # (games from one table share a schema, so this is usually a no-op)
+    games = result['games']
+    fieldnames = list(games[0])
+    seen = set(fieldnames)
+    for game in games[1:]:
+        extra = game.keys() - seen
+        if extra:
+            fieldnames.extend(sorted(extra))
+            seen.update(extra)
+    
+    # Rows as plain lists so csv.writer emits them in one C loop (no DictWriter per-row lookups)
+    rows = [[game.get(key, '') for key in fieldnames] for game in games]
+    
     # Write CSV
-    with open(filename, 'w', newline='') as f:
-        if result['games']:
-            # Get all possible field names from all games
-            fieldnames = set()
-            for game in result['games']:
-                fieldnames.update(game.keys())
-            fieldnames = sorted(list(fieldnames))
-            
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(result['games'])
+    with open(filename, 'w', newline='', buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(rows)
     
     print(f"✓ Saved CSV: {filename}")
     return filename
@@ -48,24 +70,71 @@ def save_to_csv(result, output_dir="output"):
 def save_to_json(result, output_dir="output"):
     """Save complete result to JSON file."""
     # Create output directory if it doesn't exist
-    Path(output_dir).mkdir(exist_ok=True)
+    _ensure_output_dir(output_dir)
     
     # Create filename
     if "error" in result:
         player_name_clean = result['player_name'].replace(' ', '_').lower()
         filename = f"{output_dir}/{player_name_clean}_error.json"
     else:
-        player_name_clean = result['player_name'].replace(' ', '_').lower()
-        filename = f"{output_dir}/{player_name_clean}_{result['school'].lower()}_{result['season']}.json"
+        filename = f"{output_dir}/{_player_stem(result)}.json"
     
-    # Write JSON
-    with open(filename, 'w') as f:
-        json.dump(result, f, indent=2)
+    # Write JSON: serialized in one shot by orjson, written with a single call
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
     
     print(f"✓ Saved JSON: {filename}")
     return filename
 
 
+def save_team_jsonl(results, team_key, output_dir="output"):
+    """
+    Save many player results to one JSONL file (one compact JSON object per line).
+    Use this for full-team scrapes instead of one JSON file per player.
+    """
+    _ensure_output_dir(output_dir)
+    filename = f"{output_dir}/{team_key}.jsonl"
+    
+    with open(filename, 'wb', buffering=1 << 20) as f:
+        f.writelines(orjson.dumps(result) + b'\n' for result in results)
+    
+    print(f"✓ Saved JSONL: {filename} ({len(results)} players)")
+    return filename
+
+
+def save_team_csv(results, team_key, output_dir="output"):
+    """Save the games of many player results to one CSV, with a player_name column."""
+    results = [r for r in results if "error" not in r and r.get('games')]
+    if not results:
+        print(f"No games to save for {team_key}")
+        return None
+    
+    _ensure_output_dir(output_dir)
+    filename = f"{output_dir}/{team_key}.csv"
+    
+    # Columns in first-seen order, player_name first
+    fieldnames = ['player_name']
+    seen = set(fieldnames)
+    for result in results:
+        for game in result['games']:
+            extra = game.keys() - seen
+            if extra:
+                fieldnames.extend(sorted(extra))
+                seen.update(extra)
+    
+    with open(filename, 'w', newline='', buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        for result in results:
+            name = result['player_name']
+            writer.writerows(
+                [name] + [game.get(key, '') for key in fieldnames[1:]] for game in result['games']
+            )
+    
+    print(f"✓ Saved CSV: {filename}")
+    return filename
+
+
 def main():
     """CLI entry point."""
     if len(sys.argv) < 4:
@@ -1,41 +1,76 @@
 import asyncio
+import re
 import aiohttp
-from bs4 import BeautifulSoup
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
 from datetime import datetime
 import logging
-from .platform_detector import detect_platform
+from .platform_detector import detect_platform, get_base_url
+from .error_handler import async_retry, RETRY_STATUSES
 from urllib.parse import urljoin
 
 logger = logging.getLogger(__name__)
 
+# Selectors and link-text matchers are compiled once instead of per page/row
+_SIDEARM_GAME = sv.compile('.sidearm-schedule-game')
+_SIDEARM_DATE = sv.compile('.sidearm-schedule-game-opponent-date span')
+_SIDEARM_BOX_ARIA = sv.compile('a[aria-label*="Box Score"], a[aria-label*="Stats"]')
+_PRESTO_ROW = sv.compile('tr.event-row, .schedule-game')
+_PRESTO_DATE = sv.compile('.date, .event-date')
+
+# Only the game containers are built into the soup; nav, footer and scripts are skipped at parse time
+_PLATFORM_STRAINERS = {
+    'sidearm': SoupStrainer(class_=re.compile(r'sidearm-schedule-game')),
+    'presto': SoupStrainer(class_=re.compile(r'event-row|schedule-game')),
+}
+
+_SIDEARM_BOX_TEXT = re.compile(r'Box Score|Stats')
+_BOX_TEXT = re.compile(r'Box|Stats')
+# Table fallback link lookups, evaluated by libxml2 in C rather than per-link Python predicates
+_FALLBACK_BOX_BY_TEXT = etree.XPath(
+    '(.//a[contains(., "Box") or contains(., "Stats") or contains(., "Links")])[1]'
+)
+_FALLBACK_BOX_BY_HREF = etree.XPath(
+    '(.//a[contains(translate(@href, "BOXSTA", "boxsta"), "box")'
+    ' or contains(translate(@href, "BOXSTA", "boxsta"), "stats")])[1]'
+)
+
+@async_retry(attempts=5, default=None)
 async def fetch_schedule(session, team_url):
-    """Fetch the schedule page for a team."""
-    try:
-        async with session.get(team_url, timeout=15) as response:
-            if response.status == 200:
-                return await response.text()
-    except Exception as e:
-        logger.error(f"Error fetching schedule from {team_url}: {e}")
-    return ""
+    """
+    Fetch the schedule page for a team.
+
+    Throttling and transient errors are retried with backoff; returns None once
+    retries are exhausted and "" for a page that answered with another status.
+    """
+    async with session.get(team_url, timeout=15) as response:
+        if response.status in RETRY_STATUSES:
+            response.raise_for_status()
+        if response.status == 200:
+            return await response.text()
+        logger.error(f"Error fetching schedule from {team_url}: HTTP {response.status}")
+        return ""
 
 def parse_schedule(html, platform, base_url):
     """Parse the schedule HTML based on the platform with universal fallback."""
-    soup = BeautifulSoup(html, 'html.parser')
+    strainer = _PLATFORM_STRAINERS.get(platform)
+    soup = BeautifulSoup(html, 'lxml', parse_only=strainer) if strainer else None
     games = []
 
     if platform == 'sidearm':
         # Sidearm specific parsing
-        game_elements = soup.select('.sidearm-schedule-game')
+        game_elements = _SIDEARM_GAME.select(soup)
         for element in game_elements:
             try:
                 # Extract date
-                date_el = element.select_one('.sidearm-schedule-game-opponent-date span')
+                date_el = _SIDEARM_DATE.select_one(element)
                 date_str = date_el.text.strip() if date_el else ""
                 
                 # Extract box score link
-                box_link = element.find('a', text=lambda t: t and ('Box Score' in t or 'Stats' in t))
+                box_link = element.find('a', string=_SIDEARM_BOX_TEXT)
                 if not box_link:
-                    box_link = element.select_one('a[aria-label*="Box Score"], a[aria-label*="Stats"]')
+                    box_link = _SIDEARM_BOX_ARIA.select_one(element)
                 
                 box_url = ""
                 if box_link and box_link.get('href'):
@@ -48,13 +83,13 @@ def parse_schedule(html, platform, base_url):
 
     elif platform == 'presto':
         # Presto specific parsing (often tables)
-        rows = soup.select('tr.event-row, .schedule-game')
+        rows = _PRESTO_ROW.select(soup)
         for row in rows:
             try:
-                date_el = row.select_one('.date, .event-date')
+                date_el = _PRESTO_DATE.select_one(row)
                 date_str = date_el.text.strip() if date_el else ""
                 
-                box_link = row.find('a', text=lambda t: t and ('Box' in t or 'Stats' in t))
+                box_link = row.find('a', string=_BOX_TEXT)
                 box_url = urljoin(base_url, box_link['href']) if box_link and box_link.get('href') else ""
                 
                 if date_str:
@@ -64,33 +99,53 @@ def parse_schedule(html, platform, base_url):
 
     # Universal Fallback: Look for any table containing 'Date' and links with 'Box' or 'Stats'
     if not games:
-        tables = soup.find_all('table')
-        for table in tables:
-            headers = [th.text.lower().strip() for th in table.find_all('th')]
-            rows = table.find_all('tr')
+        games = _parse_schedule_tables(html, base_url)
+
+    return games
+
+def _parse_schedule_tables(html, base_url):
+    """
+    Fallback for unknown platforms: the first table with a 'Date' column.
+
+    Runs on lxml's tree directly (text_content() and compiled XPath) since
+    this path walks every table and row on the page.
+    """
+    try:
+        doc = lxml_html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return []
+    
+    games = []
+    for table in doc.iter('table'):
+        headers = [th.text_content().lower().strip() for th in table.iter('th')]
+        
+        idx_map = {}
+        for i, h in enumerate(headers):
+            if 'date' in h: idx_map['date'] = i
+            if 'opponent' in h: idx_map['opponent'] = i
+        
+        if 'date' not in idx_map:
+            continue
+        
+        max_idx = max(idx_map.values())
+        for row in list(table.iter('tr'))[1:]:
+            cells = [c for c in row if c.tag in ('td', 'th')]
+            if len(cells) <= max_idx:
+                continue
+            date_str = cells[idx_map['date']].text_content().strip()
             
-            idx_map = {}
-            for i, h in enumerate(headers):
-                if 'date' in h: idx_map['date'] = i
-                if 'opponent' in h: idx_map['opponent'] = i
+            box_link = _FALLBACK_BOX_BY_TEXT(row)
+            if not box_link:
+                # Try finding by href pattern
+                box_link = _FALLBACK_BOX_BY_HREF(row)
             
-            if 'date' in idx_map:
-                for row in rows[1:]:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) > max(idx_map.values(), default=-1):
-                        date_str = cells[idx_map['date']].get_text(strip=True)
-                        
-                        box_link = row.find('a', text=lambda t: t and ('Box' in t or 'Stats' in t or 'Links' in t))
-                        if not box_link:
-                            # Try finding by href pattern
-                            box_link = row.find('a', href=lambda h: h and ('box' in h.lower() or 'stats' in h.lower()))
-                            
-                        box_url = urljoin(base_url, box_link['href']) if box_link and box_link.get('href') else ""
-                        
-                        if date_str and len(date_str) > 3:
-                            games.append({'date': date_str, 'box_score_url': box_url})
-                if games: break
-
+            href = box_link[0].get('href') if box_link else None
+            box_url = urljoin(base_url, href) if href else ""
+            
+            if date_str and len(date_str) > 3:
+                games.append({'date': date_str, 'box_score_url': box_url})
+        if games: break
+    
     return games
 
 async def scrape_team_schedule(session, team_url):
@@ -98,9 +153,28 @@ async def scrape_team_schedule(session, team_url):
     html = await fetch_schedule(session, team_url)
     if not html: return []
 
-    from urllib.parse import urlparse
-    parsed = urlparse(team_url)
-    base_url = f"{parsed.scheme}://{parsed.netloc}"
-
+    base_url = get_base_url(team_url)
     platform = detect_platform(team_url, html)
     return parse_schedule(html, platform, base_url)
+
+async def scrape_many(team_urls, concurrency=64):
+    """
+    Scrape several team schedules over one shared session.
+
+    Connections and DNS answers are reused across teams (many schools sit on
+    the same SIDEARM hosts), and the semaphore bounds in-flight pages.
+    Returns {team_url: games}.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=256, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=30,
+    )
+    timeout = aiohttp.ClientTimeout(total=30)
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async def scrape_one(team_url):
+            async with semaphore:
+                return await scrape_team_schedule(session, team_url)
+        
+        results = await asyncio.gather(*(scrape_one(url) for url in team_urls))
+    return dict(zip(team_urls, results))
@@ -1,27 +1,28 @@
-\"\"\"
+"""
 Schools database and normalization system.
 Contains mappings for D1, D2, D3 baseball and D1 softball.
-\"\"\"
+"""
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 # Comprehensive mapping of schools across divisions
-# Format: \"Display Name\": { \"ncaa_name\": \"...\", \"platform\": \"...\", \"division\": \"...\", \"sport\": \"...\" }
+# Format: "Display Name": { "ncaa_name": "...", "platform": "...", "division": "...", "sport": "..." }
 SCHOOLS_DB = {
     # D1 Baseball - ACC
-    \"Georgia Tech\": {
-        \"ncaa_name\": \"Georgia Institute of Technology\",
-        \"platform\": \"sidearm\",
-        \"division\": \"D1\",
-        \"sport\": \"baseball\",
+    "Georgia Tech": {
+        "ncaa_name": "Georgia Institute of Technology",
+        "platform": "sidearm",
+        "division": "D1",
+        "sport": "baseball",
         "team_website": "https://ramblinwreck.com/sports/baseball/schedule"
     },
-    \"North Carolina\": {
-        \"ncaa_name\": \"University of North Carolina\",
-        \"platform\": \"sidearm\",
-        \"division\": \"D1\",
-        \"sport\": \"baseball\",
+    "North Carolina": {
+        "ncaa_name": "University of North Carolina",
+        "platform": "sidearm",
+        "division": "D1",
+        "sport": "baseball",
         "team_website": "https://goheels.com/sports/baseball/schedule"
     },
     # Add more D1 schools here...
@@ -37,31 +38,37 @@ SCHOOLS_DB = {
 
 
     # D1 Softball
-    \"Oklahoma\": {
-        \"ncaa_name\": \"University of Oklahoma\",
-        \"platform\": \"sidearm\",
-        \"division\": \"D1\",
-        \"sport\": \"softball\",
+    "Oklahoma": {
+        "ncaa_name": "University of Oklahoma",
+        "platform": "sidearm",
+        "division": "D1",
+        "sport": "softball",
         "team_website": "https://soonersports.com/sports/softball/schedule"
     },
     # Add more softball schools here...
 
     # D2/D3 Baseball examples
-    \"Belmont Abbey\": {
-        \"ncaa_name\": \"Belmont Abbey College\",
-        \"platform\": \"presto\",
-        \"division\": \"D2\",
-        \"sport\": \"baseball\",
+    "Belmont Abbey": {
+        "ncaa_name": "Belmont Abbey College",
+        "platform": "presto",
+        "division": "D2",
+        "sport": "baseball",
         "team_website": "https://abbeyathletics.com/sports/baseball/schedule"
     }
 }
 
-def get_school_config(school_name, sport=\"baseball\"):
-    \"\"\"Get configuration for a school\"\"\"
+# (lowercased name, sport) -> config, built once; the first entry for a key wins
+_SCHOOLS_BY_KEY = {}
+for _name, _config in SCHOOLS_DB.items():
+    _SCHOOLS_BY_KEY.setdefault((_name.lower(), _config["sport"]), _config)
+
+@lru_cache(maxsize=512)
+def get_school_config(school_name, sport="baseball"):
+    """Get configuration for a school"""
     # Case-insensitive lookup
-    for name, config in SCHOOLS_DB.items():
-        if name.lower() == school_name.lower() and config[\"sport\"] == sport:
-            return config
+    config = _SCHOOLS_BY_KEY.get((school_name.lower(), sport))
+    if config is not None:
+        return config
     
     # Fallback if not found
     logger.debug(f"School '{school_name}' not in database, will use dynamic discovery")
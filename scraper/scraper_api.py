@@ -2,11 +2,11 @@
 Main API for Base44 integration.
 Universal stat extraction for all NCAA divisions.
 """
-import json
+import orjson
 import logging
 from datetime import datetime
 from .find_player_url import find_player_url
-from .parse_game_log import scrape_game_log
+from .parse_game_log import parse_game_log
 from .config import DEFAULT_SEASON
 from .schools_database import get_school_config
 from .error_handler import log_error, ScraperError
@@ -14,6 +14,24 @@ from .data_cleaner import clean_stat_value, normalize_date
 
 logger = logging.getLogger(__name__)
 
+# Game-log columns (lowercased headers) that hold numbers; everything else
+# (opponent, result, location...) is passed through as text
+_NUMERIC_KEYS = frozenset({
+    'ab', 'r', 'h', 'rbi', '2b', '3b', 'hr', 'bb', 'ibb', 'k', 'so', 'sb', 'cs',
+    'hbp', 'sh', 'sf', 'tb', 'gdp', 'avg', 'obp', 'slg', 'ops',
+    'ip', 'er', 'era', 'bf', 'np', 'w', 'l', 'sv', 'po', 'a', 'e',
+})
+
+
+def _clean_field(key, value):
+    """Normalize one game-log field for Base44 by its column name."""
+    key = key.lower()
+    if key == 'date':
+        return normalize_date(value)
+    if key in _NUMERIC_KEYS:
+        return clean_stat_value(value)
+    return value
+
 def get_player_stats(player_name, jersey_number, school, season=DEFAULT_SEASON, sport="baseball"):
     """
     Scrapes stats for ANY player from ANY NCAA school.
@@ -32,13 +50,10 @@ def get_player_stats(player_name, jersey_number, school, season=DEFAULT_SEASON,
         
     # 3. Scrape Game Log (Universal Table Extractor)
     try:
-        raw_games = scrape_game_log(player_url, season, platform_type)
+        raw_games = parse_game_log(player_url, platform_type, season)
         
         # Data Normalization for Base44
-        cleaned_games = []
-        for game in raw_games:
-            cleaned = {k: (clean_stat_value(v) if k != 'date' else normalize_date(v)) for k, v in game.items()}
-            cleaned_games.append(cleaned)
+        cleaned_games = [{k: _clean_field(k, v) for k, v in game.items()} for game in raw_games]
             
         return {
             "player_name": player_name,
@@ -52,7 +67,18 @@ def get_player_stats(player_name, jersey_number, school, season=DEFAULT_SEASON,
         return {"error": f"Stat extraction failed: {str(e)}", "success": False}
 
 
-async def get_team_games_by_date(team_schedule_url, target_dates=None, sport="baseball"):
+def get_player_stats_json(player_name, jersey_number, school, season=DEFAULT_SEASON, sport="baseball"):
+    """
+    get_player_stats serialized as a JSON string for Base44.
+    orjson encodes the whole result in one C call; datetimes are native and
+    anything else it can't encode falls back to str().
+    """
+    result = get_player_stats(player_name, jersey_number, school, season, sport)
+    return orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str).decode()
+
+
+async def get_team_games_by_date(team_schedule_url, target_dates=None, sport="baseball", session=None,
+                                 box_score_concurrency=20):
     """
     Get all games from a team's schedule and optionally filter by date.
     Returns box score URLs and game data.
@@ -61,18 +87,31 @@ async def get_team_games_by_date(team_schedule_url, target_dates=None, sport="ba
         team_schedule_url: URL to team's schedule page
         target_dates: List of date strings to filter (optional, None = all games)
         sport: Sport type (baseball/softball)
+        session: Shared aiohttp session (optional, one is opened if omitted)
+        box_score_concurrency: Max box score pages fetched at once
     
     Returns:
         List of game dictionaries with dates and box score URLs
     """
+    import asyncio
     import aiohttp
+    from contextlib import nullcontext
     from .schedule_scraper import scrape_team_schedule
     from .box_score_scraper import scrape_box_score
     from datetime import datetime
     
     logger.info(f"=== Fetching Schedule: {team_schedule_url} ===")
     
-    async with aiohttp.ClientSession() as session:
+    # Reuse the caller's session (and its pooled connections) when given one
+    if session is None:
+        # Box scores for one team mostly live on one or two hosts; cap per-host
+        # connections so concurrent fetches don't trip their rate limits
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=10, keepalive_timeout=30)
+        session_cm = aiohttp.ClientSession(connector=connector)
+    else:
+        session_cm = nullcontext(session)
+    
+    async with session_cm as session:
         # 1. Get schedule with box score URLs
         games = await scrape_team_schedule(session, team_schedule_url)
         
@@ -81,22 +120,29 @@ async def get_team_games_by_date(team_schedule_url, target_dates=None, sport="ba
         
         # 2. Filter by date if specified
         if target_dates:
-            filtered_games = []
-            for game in games:
-                game_date = game.get('date', '')
-                # Simple date matching (can be enhanced)
-                if any(target in game_date for target in target_dates):
-                    filtered_games.append(game)
-            games = filtered_games
+            # Schedule dates are free-form page text ("Feb 14 (Sat)"), so targets
+            # match as substrings
+            targets = tuple(target_dates)
+            games = [
+                game for game in games
+                if any(t in game.get('date', '') for t in targets)
+            ]
+        
+        # 3. Fetch box score data for each game concurrently, bounded by the semaphore
+        semaphore = asyncio.Semaphore(box_score_concurrency)
+        
+        async def fetch_box_score(game):
+            async with semaphore:
+                game['box_score_data'] = await scrape_box_score(session, game['box_score_url'])
         
-        # 3. Optionally fetch box score data for each game
-        enriched_games = []
-        for game in games:
-            box_url = game.get('box_score_url')
-            if box_url:
-                box_data = await scrape_box_score(session, box_url)
-                game['box_score_data'] = box_data
-            enriched_games.append(game)
+        results = await asyncio.gather(
+            *(fetch_box_score(game) for game in games if game.get('box_score_url')),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Box score fetch failed: {result}")
+        enriched_games = games
         
         return {
             "team_url": team_schedule_url,
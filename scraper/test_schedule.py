@@ -6,7 +6,7 @@ Shows how to retrieve games by date for D1, D2, D3 baseball and D1 softball.
 
 import asyncio
 import json
-from datetime import datetime, timedelta
+import sys
 from scraper_api import get_team_games_by_date
 
 # Test schools across divisions and sports
@@ -37,6 +37,35 @@ TEST_TEAMS = [
     }
 ]
 
+def format_team_report(team, result):
+    """Render one team's test output as a single string (written with one call)."""
+    lines = [
+        f"\n{'='*60}",
+        f"Team: {team['name']}",
+        f"URL: {team['url']}",
+        f"{'='*60}",
+    ]
+    
+    if isinstance(result, Exception):
+        lines.append(f"✗ Exception: {result}")
+    elif result.get('success'):
+        lines.append(f"✓ Successfully fetched {result['total_games']} games")
+        
+        # Display first 3 games as examples
+        for i, game in enumerate(result['games'][:3]):
+            lines.append(f"\n  Game {i+1}:")
+            lines.append(f"    Date: {game.get('date', 'N/A')}")
+            lines.append(f"    Box Score URL: {game.get('box_score_url', 'N/A')}")
+            if game.get('box_score_data'):
+                lines.append(f"    Box Score Data: {len(game['box_score_data'])} player records")
+        
+        if result['total_games'] > 3:
+            lines.append(f"\n  ... and {result['total_games'] - 3} more games")
+    else:
+        lines.append(f"✗ Error: {result.get('error')}")
+    
+    return '\n'.join(lines) + '\n'
+
 async def test_schedule_scraper():
     """Test the schedule scraper with multiple schools."""
     print("=" * 80)
@@ -44,42 +73,19 @@ async def test_schedule_scraper():
     print("Testing D1/D2/D3 Baseball + D1 Softball")
     print("=" * 80)
     
-    # Get today's date for filtering
-    today = datetime.now().strftime("%m/%d/%Y")
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%m/%d/%Y")
+    # Fetch all teams at once; results are printed in TEST_TEAMS order afterwards
+    async def run_team(team):
+        # Fetch all games (no date filter)
+        return await get_team_games_by_date(
+            team_schedule_url=team['url'],
+            target_dates=None,  # Get all games
+            sport=team['sport']
+        )
     
-    for team in TEST_TEAMS:
-        print(f"\n{'='*60}")
-        print(f"Team: {team['name']}")
-        print(f"URL: {team['url']}")
-        print(f"{'='*60}")
-        
-        try:
-            # Fetch all games (no date filter)
-            result = await get_team_games_by_date(
-                team_schedule_url=team['url'],
-                target_dates=None,  # Get all games
-                sport=team['sport']
-            )
-            
-            if result.get('success'):
-                print(f"✓ Successfully fetched {result['total_games']} games")
-                
-                # Display first 3 games as examples
-                for i, game in enumerate(result['games'][:3]):
-                    print(f"\n  Game {i+1}:")
-                    print(f"    Date: {game.get('date', 'N/A')}")
-                    print(f"    Box Score URL: {game.get('box_score_url', 'N/A')}")
-                    if game.get('box_score_data'):
-                        print(f"    Box Score Data: {len(game['box_score_data'])} player records")
-                
-                if result['total_games'] > 3:
-                    print(f"\n  ... and {result['total_games'] - 3} more games")
-            else:
-                print(f"✗ Error: {result.get('error')}")
-                
-        except Exception as e:
-            print(f"✗ Exception: {e}")
+    results = await asyncio.gather(*(run_team(team) for team in TEST_TEAMS), return_exceptions=True)
+    
+    for team, result in zip(TEST_TEAMS, results):
+        sys.stdout.write(format_team_report(team, result))
     
     print("\n" + "="*80)
     print("TEST COMPLETE")
@@ -2,9 +2,27 @@
 Utility functions for data cleaning and processing.
 """
 
+import math
 import re
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_WS_RE = re.compile(r'\s+')
+
+
+class _NumericOnlyTable(dict):
+    """str.translate table keeping digits, '.' and '-'; every other code point is deleted."""
+    def __missing__(self, codepoint):
+        self[codepoint] = None  # remembered, so each code point costs one Python call
+        return None
+
+
+# safe_int's scrub: covers all of Unicode (zero-width spaces, daggers, en dashes...)
+_NON_NUM_TABLE = _NumericOnlyTable({ord(c): ord(c) for c in '0123456789.-'})
 
 
 def clean_text(text: str) -> str:
@@ -19,12 +37,46 @@ def clean_text(text: str) -> str:
     """
     if not text:
         return ""
+    # Already clean: the only whitespace is single spaces (isprintable() is False
+    # for tabs, newlines, &nbsp; and every other non-space whitespace)
+    if '  ' not in text and text.isprintable():
+        return text.strip()
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     # Strip leading/trailing whitespace
     return text.strip()
 
 
+# Month names as strptime's %b / %B accept them
+_MONTHS = {}
+for _i, _name in enumerate(('january', 'february', 'march', 'april', 'may', 'june', 'july',
+                            'august', 'september', 'october', 'november', 'december'), 1):
+    _MONTHS[_name] = _MONTHS[_name[:3]] = _i
+
+# Every supported date format in one pattern; which groups matched says which format it was
+_DATE_RE = re.compile(
+    r'(\d{1,2})([/.-])(\d{1,2})\2(\d{4}|\d{2})'  # 03/04/2025, 03/04/25, 03-04-2025, 03.04.2025
+    r'|(\d{4})-(\d{1,2})-(\d{1,2})'             # 2025-03-04
+    r'|([A-Za-z]+)\s+(\d{1,2}),\s+(\d{4})'       # Mar 04, 2025 / March 04, 2025
+)
+
+
+# parse_date_series: the _DATE_RE forms parse_date turns down, and its output
+_DASHED_SHORT_YEAR_RE = re.compile(r'\d{1,2}([.-])\d{1,2}\1\d{2}')
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+# A free-form date worth handing to dateutil must at least name a year; this
+# keeps "TBA" or "Sat" from being filled in with today's date
+_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+
+# dateutil fills anything the string lacks from `default`; parsing against two
+# defaults that differ in month and day shows whether those came from the string
+_DATE_DEFAULTS = (datetime(2000, 1, 1), datetime(2000, 2, 2))
+
+
+# The same few date strings repeat across every row and page of a run
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> str:
     """
     Parse date string into ISO format (YYYY-MM-DD).
@@ -40,28 +92,65 @@ def parse_date(date_str: str) -> str:
     
     date_str = clean_text(date_str)
     
-    # Common date formats in college sports websites
-    formats = [
-        '%m/%d/%Y',      # 03/04/2025
-        '%m/%d/%y',      # 03/04/25
-        '%m-%d-%Y',      # 03-04-2025
-        '%Y-%m-%d',      # 2025-03-04
-        '%b %d, %Y',     # Mar 04, 2025
-        '%B %d, %Y',     # March 04, 2025
-        '%m.%d.%Y',      # 03.04.2025
-    ]
-    
-    for fmt in formats:
+    # Already ISO (e.g. re-fed output): the C parser, no regex
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
         try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.strftime('%Y-%m-%d')
+            return date.fromisoformat(date_str).isoformat()
         except ValueError:
-            continue
+            pass
     
-    # If no format matches, return original
+    match = _DATE_RE.fullmatch(date_str)
+    if not match:
+        return _parse_free_form_date(date_str)
+    
+    (month, sep, day, year,
+     iso_year, iso_month, iso_day,
+     month_name, named_day, named_year) = match.groups()
+    try:
+        if month:
+            if len(year) == 4:
+                year = int(year)
+            elif sep == '/':
+                # Same pivot as strptime's %y: 69-99 -> 19xx, 00-68 -> 20xx
+                year = int(year)
+                year += 1900 if year >= 69 else 2000
+            else:
+                return date_str  # two-digit years only come with slashes
+            return date(year, int(month), int(day)).isoformat()
+        if iso_year:
+            return date(int(iso_year), int(iso_month), int(iso_day)).isoformat()
+        month = _MONTHS.get(month_name.lower())
+        if not month:
+            # Month spellings strptime doesn't know ("Sept") are dateutil's job
+            return _parse_free_form_date(date_str)
+        return date(int(named_year), month, int(named_day)).isoformat()
+    except ValueError:  # out-of-range month/day
+        pass
     return date_str
 
 
+def _parse_free_form_date(date_str: str) -> str:
+    """
+    Catch-all for formats the regex doesn't know ("Sat, Mar. 4, 2025", "Sept 4, 2025").
+    One dateutil call instead of probing format after format; original string on failure.
+    """
+    if not _YEAR_RE.search(date_str):
+        return date_str
+    from dateutil import parser as dateutil_parser  # only needed for odd formats
+    
+    try:
+        parsed = dateutil_parser.parse(date_str, default=_DATE_DEFAULTS[0], dayfirst=False)
+        if parsed.month == 1 or parsed.day == 1:
+            # Could be the default; "2025" or "March 2025" is not a date
+            other = dateutil_parser.parse(date_str, default=_DATE_DEFAULTS[1], dayfirst=False)
+            if (other.month, other.day) != (parsed.month, parsed.day):
+                return date_str
+        return parsed.date().isoformat()
+    except (ValueError, OverflowError):
+        return date_str
+
+
+@lru_cache(maxsize=1024)
 def extract_home_away(opponent: str, result: str = "") -> str:
     """
     Determine if game is home or away based on opponent string.
@@ -73,14 +162,16 @@ def extract_home_away(opponent: str, result: str = "") -> str:
     Returns:
         "home", "away", or "neutral"
     """
-    text = (opponent + " " + result).lower()
-    
-    if '@' in text or 'at ' in text:
-        return "away"
-    elif 'vs' in text or 'vs.' in text:
-        return "home"
-    else:
-        return "neutral"
+    # Opponent column decides; the result column is only consulted if it's ambiguous
+    for text in (opponent, result):
+        if not text:
+            continue
+        text = text.lower()
+        if '@' in text or text.startswith('at ') or ' at ' in text:
+            return "away"
+        if 'vs' in text:
+            return "home"
+    return "neutral"
 
 
 def safe_int(value: str, default: Optional[int] = None) -> Optional[int]:
@@ -97,9 +188,73 @@ def safe_int(value: str, default: Optional[int] = None) -> Optional[int]:
     if not value:
         return default
     
+    # Fast paths: real ints, finite floats and plain integer strings ("12", "-3")
+    if type(value) is int:
+        return value
+    if type(value) is float:
+        return int(value) if math.isfinite(value) else default
+    if type(value) is str:
+        stripped = value.strip()
+        digits = stripped[1:] if stripped[:1] == '-' else stripped
+        if digits.isascii() and digits.isdigit():
+            return int(stripped)
+    
     try:
         # Remove common non-numeric characters
-        cleaned = re.sub(r'[^0-9.-]', '', str(value))
+        cleaned = str(value).translate(_NON_NUM_TABLE)
         return int(float(cleaned)) if cleaned else default
     except (ValueError, TypeError):
         return default
+
+
+def safe_int_series(values: "pd.Series", default: Optional[int] = None) -> "pd.Series":
+    """
+    Vectorized safe_int for a whole column (e.g. a box score DataFrame's 'AB').
+    
+    Args:
+        values: Series of raw cell values
+        default: Value for cells that don't convert (missing, i.e. <NA>, if None)
+        
+    Returns:
+        Nullable Int64 Series
+    """
+    # Only the column helpers need numpy/pandas; scalar callers never load them
+    import numpy as np
+    import pandas as pd
+    
+    cleaned = values.astype(str).str.replace(r'[^0-9.-]', '', regex=True)
+    numbers = np.trunc(pd.to_numeric(cleaned, errors='coerce')).astype('Int64')
+    return numbers if default is None else numbers.fillna(default)
+
+
+def parse_date_series(values: "pd.Series") -> "pd.Series":
+    """
+    Vectorized parse_date for a whole column.
+    
+    Cells in parse_date's regex formats are parsed by pandas in one pass; the
+    rest (free-form text, "2025", "Mar 4") go through parse_date itself, once
+    per distinct string, so both helpers accept and reject the same cells.
+    
+    Args:
+        values: Series of date strings in various formats
+        
+    Returns:
+        Series of ISO dates; cells that don't parse keep their original value
+    """
+    import numpy as np
+    import pandas as pd
+    
+    text = values.astype(str).str.strip()
+    # parse_date rejects two-digit years unless they come with slashes
+    known = text.str.fullmatch(_DATE_RE) & ~text.str.fullmatch(_DASHED_SHORT_YEAR_RE)
+    parsed = pd.to_datetime(text.where(known), errors='coerce', format='mixed')
+    # datetime_as_string formats the whole array in C; .dt.strftime goes element by element
+    iso = np.datetime_as_string(parsed.to_numpy(dtype='datetime64[D]'), unit='D')
+    result = pd.Series(iso, index=values.index, dtype=object).where(parsed.notna(), values)
+    
+    other = ~known
+    if other.any():
+        # parse_date is lru-cached, so repeated strings cost one call
+        dates = text[other].map(parse_date)
+        result[other] = dates.where(dates.str.fullmatch(_ISO_DATE_RE), values[other])
+    return result
@@ -0,0 +1,90 @@
+"""
+Optional Numba-compiled helpers for bulk stat conversion.
+
+Numba is not a hard dependency: without it safe_int_batch simply maps
+utils.safe_int over the values, so importing this module is always safe.
+"""
+
+import numpy as np
+from typing import List, Optional
+from .utils import safe_int
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# Marks cells parse_ints_bytes couldn't convert
+MISSING = np.iinfo(np.int64).min
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def parse_ints_bytes(buf, offsets):
+        """
+        Convert packed cells to int64, the same way safe_int does.
+
+        Args:
+            buf: uint8 array holding every cell's bytes back to back
+            offsets: int64 array of len(cells) + 1 cell boundaries into buf
+
+        Returns:
+            int64 array, MISSING where a cell has no valid number
+        """
+        n = offsets.shape[0] - 1
+        out = np.empty(n, np.int64)
+        for i in range(n):
+            value = 0
+            digits = 0
+            negative = False
+            seen_dot = False
+            seen_any = False
+            valid = True
+            for j in range(offsets[i], offsets[i + 1]):
+                c = buf[j]
+                if 48 <= c <= 57:  # digit; anything after '.' is truncated away
+                    if not seen_dot:
+                        value = value * 10 + (c - 48)
+                    digits += 1
+                elif c == 45:  # '-' only counts as a leading sign
+                    if seen_any:
+                        valid = False
+                        break
+                    negative = True
+                elif c == 46:  # '.'
+                    if seen_dot:
+                        valid = False
+                        break
+                    seen_dot = True
+                else:  # every other character is scrubbed, as in safe_int
+                    continue
+                seen_any = True
+            if valid and digits:
+                out[i] = -value if negative else value
+            else:
+                out[i] = MISSING
+        return out
+
+
+def safe_int_batch(values, default: Optional[int] = None) -> List[Optional[int]]:
+    """
+    safe_int over a whole column of cells in one compiled pass.
+
+    Args:
+        values: Iterable of raw cell values
+        default: Value for cells that don't convert
+
+    Returns:
+        List of integers (or default), one per value
+    """
+    values = list(values)
+    if not HAVE_NUMBA:
+        return [safe_int(v, default) for v in values]
+
+    cells = [str(v).encode('latin-1', 'ignore') if v else b'' for v in values]
+    offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+    np.cumsum([len(c) for c in cells], out=offsets[1:])
+    buf = np.frombuffer(b''.join(cells), dtype=np.uint8)
+
+    return [default if n == MISSING else int(n) for n in parse_ints_bytes(buf, offsets)]
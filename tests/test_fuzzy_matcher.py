@@ -0,0 +1,22 @@
+import unittest
+
+from scraper.fuzzy_matcher import find_best_match, find_best_matches, names_match
+
+
+class InitialMatchTest(unittest.TestCase):
+    def test_find_best_match_agrees_with_names_match_on_different_first_names(self):
+        self.assertFalse(names_match("Jake Smith", "Jack Smith"))
+        self.assertIsNone(find_best_match("Jake Smith", ["Jack Smith"]))
+        self.assertEqual(find_best_matches(["Jake Smith"], ["Jack Smith"]), {"Jake Smith": None})
+
+    def test_bare_initial_matches_either_way(self):
+        self.assertTrue(names_match("M. Smith", "Mike Smith"))
+        self.assertEqual(find_best_match("M. Smith", ["Mike Smith"]), "Mike Smith")
+        self.assertEqual(find_best_match("Mike Smith", ["M. Smith"]), "M. Smith")
+
+    def test_typo_in_last_name_still_matches(self):
+        self.assertEqual(find_best_match("Jon Smyth", ["John Smith", "Tom Brady"]), "John Smith")
+
+
+if __name__ == '__main__':
+    unittest.main()
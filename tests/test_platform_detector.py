@@ -0,0 +1,18 @@
+import unittest
+
+from scraper.platform_detector import detect_platform
+
+
+class DetectPlatformHtmlTest(unittest.TestCase):
+    def test_marker_case_insensitive(self):
+        self.assertEqual(detect_platform('https://x.edu/', 'Powered by SIDEARM Sports'), 'sidearm')
+        self.assertEqual(detect_platform('https://x.edu/', b'Stretch Internet'), 'stretch')
+
+    def test_non_ascii_lookalikes_are_not_markers(self):
+        # Long s and dotless i case-fold to ASCII letters under Unicode rules
+        self.assertEqual(detect_platform('https://x.edu/', 'ſidearm sports'), 'generic')
+        self.assertEqual(detect_platform('https://x.edu/', 'Stretch ınternet'), 'generic')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,20 @@
+import unittest
+
+from scraper.utils import parse_date
+
+
+class ParseDateTest(unittest.TestCase):
+    def test_known_formats(self):
+        self.assertEqual(parse_date("03/04/2025"), "2025-03-04")
+        self.assertEqual(parse_date("Mar 04, 2025"), "2025-03-04")
+
+    def test_unknown_month_word_goes_to_dateutil(self):
+        self.assertEqual(parse_date("Sept 4, 2025"), "2025-09-04")
+
+    def test_year_without_day_is_not_a_date(self):
+        self.assertEqual(parse_date("2025"), "2025")
+        self.assertEqual(parse_date("March 2025"), "March 2025")
+
+
+if __name__ == '__main__':
+    unittest.main()